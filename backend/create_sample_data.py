@@ -7,8 +7,12 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'task_management.settings')
 django.setup()
 
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
 from tasks.models import Task, TaskDependency
 
+@transaction.atomic
 def create_sample_data():
     """Create sample tasks and dependencies for demonstration."""
     
@@ -20,7 +24,7 @@ def create_sample_data():
     tasks = []
     
     # Project setup tasks
-    task1 = Task.objects.create(
+    task1 = Task(
         title="Setup Development Environment",
         description="Install Python, Django, and required dependencies",
         status="completed",
@@ -29,7 +33,7 @@ def create_sample_data():
     )
     tasks.append(task1)
     
-    task2 = Task.objects.create(
+    task2 = Task(
         title="Design Database Schema",
         description="Create ERD and define table relationships",
         status="completed",
@@ -38,7 +42,7 @@ def create_sample_data():
     )
     tasks.append(task2)
     
-    task3 = Task.objects.create(
+    task3 = Task(
         title="Implement User Authentication",
         description="Create login, registration, and session management",
         status="in_progress",
@@ -47,7 +51,7 @@ def create_sample_data():
     )
     tasks.append(task3)
     
-    task4 = Task.objects.create(
+    task4 = Task(
         title="Create Task Management API",
         description="Build REST API endpoints for task CRUD operations",
         status="pending",
@@ -56,7 +60,7 @@ def create_sample_data():
     )
     tasks.append(task4)
     
-    task5 = Task.objects.create(
+    task5 = Task(
         title="Implement Dependency Logic",
         description="Add circular dependency detection and status propagation",
         status="pending",
@@ -65,7 +69,7 @@ def create_sample_data():
     )
     tasks.append(task5)
     
-    task6 = Task.objects.create(
+    task6 = Task(
         title="Build Frontend Components",
         description="Create React components for task management UI",
         status="pending",
@@ -74,7 +78,7 @@ def create_sample_data():
     )
     tasks.append(task6)
     
-    task7 = Task.objects.create(
+    task7 = Task(
         title="Add Graph Visualization",
         description="Implement Canvas-based dependency graph",
         status="pending",
@@ -83,7 +87,7 @@ def create_sample_data():
     )
     tasks.append(task7)
     
-    task8 = Task.objects.create(
+    task8 = Task(
         title="Write Unit Tests",
         description="Create comprehensive test suite for backend and frontend",
         status="pending",
@@ -92,7 +96,7 @@ def create_sample_data():
     )
     tasks.append(task8)
     
-    task9 = Task.objects.create(
+    task9 = Task(
         title="Deploy to Production",
         description="Setup production environment and deploy application",
         status="pending",
@@ -101,7 +105,7 @@ def create_sample_data():
     )
     tasks.append(task9)
     
-    task10 = Task.objects.create(
+    task10 = Task(
         title="User Documentation",
         description="Write user manual and API documentation",
         status="pending",
@@ -127,20 +131,44 @@ def create_sample_data():
         (task10, task9), # Documentation depends on deploy
     ]
     
-    for task, depends_on in dependencies:
-        TaskDependency.objects.create(task=task, depends_on=depends_on)
+    # Insert all tasks in one statement
+    Task.objects.bulk_create(tasks)
+    if any(task.pk is None for task in tasks):
+        # Backends without RETURNING support (e.g. MySQL) leave pk unset
+        saved_ids = dict(Task.objects.values_list('title', 'id'))
+        for task in tasks:
+            task.pk = saved_ids[task.title]
+            task._state.adding = False
+    
+    # Validate all dependencies once, then insert them in one statement
+    TaskDependency.bulk_create_validated([
+        TaskDependency(task=task, depends_on=depends_on)
+        for task, depends_on in dependencies
+    ])
     
     print(f"Created {len(tasks)} tasks and {len(dependencies)} dependencies")
     
-    # Update task statuses based on dependencies
-    for task in Task.objects.all():
-        task.update_status_based_on_dependencies()
+    # Update task statuses based on dependencies using the in-memory graph
+    tasks_by_id, deps_by_id = Task._load_graph()
+    ids_by_status = {}
+    for task_id, (task_status, _) in tasks_by_id.items():
+        dependency_statuses = [tasks_by_id[dep_id][0] for dep_id in deps_by_id.get(task_id, [])]
+        new_status = Task.status_for(
+            task_status,
+            has_blocked='blocked' in dependency_statuses,
+            has_incomplete=any(s != 'completed' for s in dependency_statuses),
+        )
+        if new_status != task_status:
+            ids_by_status.setdefault(new_status, []).append(task_id)
+    now = timezone.now()
+    for new_status, ids in ids_by_status.items():
+        Task.objects.filter(id__in=ids).update(status=new_status, updated_at=now)
     
     print("Sample data created successfully!")
     print("\nTask Status Summary:")
+    counts = dict(Task.objects.values_list('status').annotate(n=Count('id')).order_by())
     for status in ['pending', 'in_progress', 'completed', 'blocked']:
-        count = Task.objects.filter(status=status).count()
-        print(f"  {status.replace('_', ' ').title()}: {count}")
+        print(f"  {status.replace('_', ' ').title()}: {counts.get(status, 0)}")
 
 if __name__ == '__main__':
     create_sample_data()
\ No newline at end of file
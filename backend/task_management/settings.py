@@ -73,6 +73,10 @@ DATABASES = {
         'PASSWORD': config('DB_PASSWORD', default=''),
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='3306'),
+        # Reuse connections across requests instead of reconnecting to MySQL
+        # for every one; stale connections are checked before reuse
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'sql_mode': 'traditional',
             'charset': 'utf8mb4',
@@ -2,9 +2,20 @@
 Admin configuration for tasks app.
 """
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from .models import Task, TaskDependency
 
 
+class TaskChangeList(ChangeList):
+    """Change list that only loads the columns shown in the task list."""
+
+    def get_queryset(self, request, *args, **kwargs):
+        """Skip large columns such as description."""
+        return super().get_queryset(request, *args, **kwargs).only(
+            'id', 'title', 'status', 'created_at', 'updated_at'
+        )
+
+
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
     """Admin interface for Task model."""
@@ -24,6 +35,10 @@ class TaskAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_changelist(self, request, **kwargs):
+        """Use a change list with a narrowed queryset."""
+        return TaskChangeList
+
 
 @admin.register(TaskDependency)
 class TaskDependencyAdmin(admin.ModelAdmin):
@@ -32,8 +47,12 @@ class TaskDependencyAdmin(admin.ModelAdmin):
     list_display = ['task', 'depends_on', 'created_at']
     list_filter = ['created_at']
     search_fields = ['task__title', 'depends_on__title']
-    readonly_fields = ['created_at']
+    readonly_fields = ['created_at', 'updated_at']
     
     def get_queryset(self, request):
-        """Optimize queryset with select_related."""
-        return super().get_queryset(request).select_related('task', 'depends_on')
\ No newline at end of file
+        """Optimize queryset with select_related, loading only the columns displayed."""
+        return super().get_queryset(request).select_related('task', 'depends_on').only(
+            'id', 'created_at',
+            'task__id', 'task__title', 'task__status',
+            'depends_on__id', 'depends_on__title', 'depends_on__status',
+        )
\ No newline at end of file
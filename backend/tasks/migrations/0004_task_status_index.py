@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-14 05:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_estimated_hours_task_priority'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status'], name='tasks_status_idx'),
+        ),
+    ]
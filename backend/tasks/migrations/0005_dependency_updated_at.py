@@ -0,0 +1,26 @@
+# Generated by Django 4.2.7 on 2026-10-14 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_task_status_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskdependency',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['updated_at'], name='tasks_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskdependency',
+            index=models.Index(fields=['updated_at'], name='task_deps_updated_at_idx'),
+        ),
+    ]
@@ -1,9 +1,14 @@
 """
 Task and TaskDependency models for the task management system.
 """
-from django.db import models, transaction
+import logging
+from collections import deque
+from django.db import connection, models, transaction
 from django.core.exceptions import ValidationError
-from typing import List, Set, Dict, Optional
+from django.utils import timezone
+from typing import List, Set, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 
 class TaskPriority(models.IntegerChoices):
@@ -23,6 +28,10 @@ class TaskStatus(models.TextChoices):
     BLOCKED = 'blocked', 'Blocked'
 
 
+# Every status value, for membership checks in serializers and views
+VALID_STATUSES = frozenset(TaskStatus.values)
+
+
 class Task(models.Model):
     """
     Task model representing a single task in the system.
@@ -50,10 +59,26 @@ class Task(models.Model):
     class Meta:
         db_table = 'tasks'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status'], name='tasks_status_idx'),
+            # Lets MAX(updated_at) for the read endpoints' ETag use the index
+            models.Index(fields=['updated_at'], name='tasks_updated_at_idx'),
+        ]
+
+    # Status as last read from or written to the database (None for new instances)
+    _loaded_status = None
 
     def __str__(self):
         return f"{self.title} ({self.get_status_display()})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Snapshot the loaded status so save() does not need to re-read the row."""
+        instance = super().from_db(db, field_names, values)
+        # Read from __dict__ so a deferred status field is not fetched here
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
     def get_dependencies(self) -> List['Task']:
         """Get all tasks this task depends on."""
         return [dep.depends_on for dep in self.dependencies.all()]
@@ -62,79 +87,200 @@ class Task(models.Model):
         """Get all tasks that depend on this task."""
         return [dep.task for dep in self.dependent_tasks.all()]
 
+    def _has_prefetched_dependencies(self) -> bool:
+        """Check whether the dependencies relation was loaded with prefetch_related."""
+        return 'dependencies' in getattr(self, '_prefetched_objects_cache', {})
+
     def can_start(self) -> bool:
         """Check if task can start (all dependencies completed)."""
-        dependencies = self.get_dependencies()
-        if not dependencies:
-            return True
-        return all(dep.status == TaskStatus.COMPLETED for dep in dependencies)
+        if self._has_prefetched_dependencies():
+            return all(dep.status == TaskStatus.COMPLETED for dep in self.get_dependencies())
+        # Single EXISTS query; no dependency rows are loaded
+        return not self.dependencies.exclude(depends_on__status=TaskStatus.COMPLETED).exists()
 
-    def get_estimated_completion_time(self) -> dict:
+    @classmethod
+    def _load_graph(cls) -> Tuple[Dict[int, Tuple[str, int]], Dict[int, List[int]]]:
         """
-        Calculate estimated completion time based on dependencies.
-        Returns dict with total_hours and critical_path.
+        Load every task and dependency edge in two queries.
+        Returns (tasks_by_id, deps_by_id) where tasks_by_id maps a task id to
+        its (status, estimated_hours) and deps_by_id maps a task id to the ids
+        of the tasks it depends on.
         """
-        if self.status == TaskStatus.COMPLETED:
-            return {
-                'total_hours': 0,
-                'critical_path': [self.id],
-                'can_start_immediately': True
-            }
+        # Only the columns the graph walks read
+        tasks_by_id = {
+            task_id: (task_status, estimated_hours)
+            for task_id, task_status, estimated_hours in cls.objects.values_list(
+                'id', 'status', 'estimated_hours'
+            )
+        }
+        deps_by_id = {}
+        for task_id, depends_on_id in TaskDependency.objects.values_list('task_id', 'depends_on_id'):
+            deps_by_id.setdefault(task_id, []).append(depends_on_id)
+        return tasks_by_id, deps_by_id
+
+    @classmethod
+    def compute_all_critical_paths(cls) -> Dict[int, Tuple[int, List[int]]]:
+        """
+        Compute the remaining critical path of every task in a single pass.
+        Returns {task_id: (total_hours, critical_path)}.
+        """
+        tasks_by_id, deps_by_id = cls._load_graph()
+        return cls._critical_paths(tasks_by_id, deps_by_id)
+
+    @staticmethod
+    def _critical_paths(
+        tasks_by_id: Dict[int, Tuple[str, int]],
+        deps_by_id: Dict[int, List[int]]
+    ) -> Dict[int, Tuple[int, List[int]]]:
+        """
+        Longest path through incomplete dependencies for every task.
+        Orders tasks topologically (Kahn's algorithm) so each task is visited
+        once, after all of its dependencies. Completed tasks contribute no
+        hours. Tasks on or behind a cycle are never ordered; they are walked
+        depth-first afterwards, ignoring the edge that closes each cycle.
         
-        # Build dependency graph
-        visited = set()
+        Time Complexity: O(V + E)
+        """
+        paths = {}
         
-        def calculate_path_time(task_id: int) -> tuple:
-            """Returns (max_hours_to_completion, critical_path)"""
-            if task_id in visited:
-                return (0, [])  # Avoid cycles
-            
-            visited.add(task_id)
-            
-            try:
-                task = Task.objects.get(id=task_id)
-            except Task.DoesNotExist:
-                return (0, [])
-            
-            if task.status == TaskStatus.COMPLETED:
+        def path_through(task_id: int) -> Tuple[int, List[int]]:
+            """(hours, path) for a task from the paths of its dependencies so far."""
+            task_status, estimated_hours = tasks_by_id[task_id]
+            if task_status == TaskStatus.COMPLETED:
                 return (0, [])
             
-            # Get dependencies
-            dependencies = task.get_dependencies()
-            
-            if not dependencies:
-                # No dependencies, just this task's time
-                return (task.estimated_hours, [task_id])
-            
             # Find the longest dependency path
             max_dep_time = 0
             critical_dep_path = []
-            
-            for dep in dependencies:
-                if dep.status != TaskStatus.COMPLETED:
-                    dep_time, dep_path = calculate_path_time(dep.id)
-                    if dep_time > max_dep_time:
-                        max_dep_time = dep_time
-                        critical_dep_path = dep_path
+            for dep_id in deps_by_id.get(task_id, []):
+                dep_time, dep_path = paths.get(dep_id, (0, []))
+                if dep_time > max_dep_time:
+                    max_dep_time = dep_time
+                    critical_dep_path = dep_path
             
             # Add this task's time to the critical path
-            total_time = max_dep_time + task.estimated_hours
-            full_path = critical_dep_path + [task_id]
-            
-            return (total_time, full_path)
+            return (max_dep_time + estimated_hours, critical_dep_path + [task_id])
+        
+        remaining = {}
+        dependents_by_id = {}
+        for task_id in tasks_by_id:
+            dep_ids = [dep_id for dep_id in deps_by_id.get(task_id, []) if dep_id in tasks_by_id]
+            remaining[task_id] = len(dep_ids)
+            for dep_id in dep_ids:
+                dependents_by_id.setdefault(dep_id, []).append(task_id)
         
-        total_hours, critical_path = calculate_path_time(self.id)
+        queue = deque(task_id for task_id, count in remaining.items() if count == 0)
+        while queue:
+            task_id = queue.popleft()
+            paths[task_id] = path_through(task_id)
+            for dependent_id in dependents_by_id.get(task_id, []):
+                remaining[dependent_id] -= 1
+                if remaining[dependent_id] == 0:
+                    queue.append(dependent_id)
         
+        # Iterative post-order DFS over the leftovers. A dependency still on the
+        # stack (cycle_guard) counts as (0, []), which breaks the cycle there.
+        cycle_guard = set()
+        for start_id in tasks_by_id:
+            if start_id in paths:
+                continue
+            cycle_guard.add(start_id)
+            stack = [(start_id, iter(deps_by_id.get(start_id, [])))]
+            while stack:
+                task_id, dep_ids = stack[-1]
+                for dep_id in dep_ids:
+                    if dep_id in tasks_by_id and dep_id not in paths and dep_id not in cycle_guard:
+                        cycle_guard.add(dep_id)
+                        stack.append((dep_id, iter(deps_by_id.get(dep_id, []))))
+                        break
+                else:
+                    stack.pop()
+                    cycle_guard.discard(task_id)
+                    paths[task_id] = path_through(task_id)
+        
+        return paths
+
+    @classmethod
+    def attach_estimated_completions(cls, tasks: List['Task']) -> None:
+        """
+        Set _estimated_completion on each task, loading the dependency graph
+        at most once for the whole batch.
+        """
+        graph = None
+        if any(task.status != TaskStatus.COMPLETED for task in tasks):
+            tasks_by_id, deps_by_id = cls._load_graph()
+            graph = (tasks_by_id, deps_by_id, cls._critical_paths(tasks_by_id, deps_by_id))
+        for task in tasks:
+            task._estimated_completion = task._estimated_completion_from(graph)
+
+    def _estimated_completion_from(self, graph) -> dict:
+        """Estimated completion from a loaded (tasks_by_id, deps_by_id, paths) graph."""
+        if self.status == TaskStatus.COMPLETED:
+            return {
+                'total_hours': 0,
+                'critical_path': [self.id],
+                'can_start_immediately': True
+            }
+
+        tasks_by_id, deps_by_id, paths = graph
+        total_hours, critical_path = paths.get(self.id, (0, []))
+
+        can_start_immediately = all(
+            tasks_by_id[dep_id][0] == TaskStatus.COMPLETED
+            for dep_id in deps_by_id.get(self.id, [])
+            if dep_id in tasks_by_id
+        )
+
         return {
             'total_hours': total_hours,
             'critical_path': critical_path,
-            'can_start_immediately': self.can_start()
+            'can_start_immediately': can_start_immediately
         }
 
+    def get_estimated_completion_time(self) -> dict:
+        """
+        Calculate estimated completion time based on dependencies.
+        Returns dict with total_hours and critical_path.
+        """
+        # Load the whole dependency graph once and walk it in memory
+        Task.attach_estimated_completions([self])
+        return self._estimated_completion
+
     def is_blocked(self) -> bool:
         """Check if task is blocked by any dependency."""
-        dependencies = self.get_dependencies()
-        return any(dep.status == TaskStatus.BLOCKED for dep in dependencies)
+        if self._has_prefetched_dependencies():
+            return any(dep.status == TaskStatus.BLOCKED for dep in self.get_dependencies())
+        # Single EXISTS query; no dependency rows are loaded
+        return self.dependencies.filter(depends_on__status=TaskStatus.BLOCKED).exists()
+
+    def resolve_status(self, dependency_statuses: List[str]) -> str:
+        """
+        Apply the dependency status rules to already-loaded dependency statuses.
+        Returns the status this task should have; does not save.
+        """
+        return Task.status_for(
+            self.status,
+            has_blocked=any(s == TaskStatus.BLOCKED for s in dependency_statuses),
+            has_incomplete=any(s != TaskStatus.COMPLETED for s in dependency_statuses),
+        )
+
+    @staticmethod
+    def status_for(status: str, has_blocked: bool, has_incomplete: bool) -> str:
+        """
+        Apply the dependency status rules to a task's current status, given
+        whether any dependency is blocked and whether any is not completed.
+        """
+        if status == TaskStatus.COMPLETED:
+            return status
+        if has_blocked:
+            return TaskStatus.BLOCKED
+        if not has_incomplete:
+            if status in [TaskStatus.PENDING, TaskStatus.BLOCKED]:
+                return TaskStatus.IN_PROGRESS
+            return status
+        if status == TaskStatus.IN_PROGRESS:
+            return TaskStatus.PENDING
+        return status
 
     def update_status_based_on_dependencies(self) -> bool:
         """
@@ -161,9 +307,9 @@ class Task(models.Model):
             if self.status in [TaskStatus.PENDING, TaskStatus.BLOCKED]:
                 self.status = TaskStatus.IN_PROGRESS
         # Rule 3: If dependencies exist but not all completed → status remains 'pending'
+        # (can_start() is False here, so incomplete dependencies exist)
         else:
-            dependencies = self.get_dependencies()
-            if dependencies and self.status == TaskStatus.IN_PROGRESS:
+            if self.status == TaskStatus.IN_PROGRESS:
                 # Demote from in_progress to pending if dependencies are no longer satisfied
                 self.status = TaskStatus.PENDING
             
@@ -183,20 +329,19 @@ class Task(models.Model):
             if expected_version is not None:
                 current_task = Task.objects.filter(pk=self.pk, version=expected_version).first()
                 if not current_task:
-                    from django.core.exceptions import ValidationError
                     raise ValidationError(
                         "This task was modified by another user. Please refresh and try again.",
                         code='concurrent_modification'
                     )
             
-            # Get old status for propagation
-            old_instance = Task.objects.get(pk=self.pk)
-            old_status = old_instance.status
+            # Old status for propagation, as loaded from the database
+            old_status = self._loaded_status
             
             # Increment version on update
             self.version += 1
             
         super().save(*args, **kwargs)
+        self._loaded_status = self.__dict__.get('status')
         
         # Temporarily disable automatic status propagation to avoid interference
         # with manual updates. Users should have full control over task status.
@@ -205,13 +350,50 @@ class Task(models.Model):
 
     def propagate_status_update(self):
         """
-        Propagate status changes to dependent tasks recursively.
+        Propagate status changes to dependent tasks.
+        Walks dependents breadth-first over the preloaded graph and writes
+        the changed tasks with one UPDATE per resulting status.
         """
-        dependents = self.get_dependents()
-        for dependent in dependents:
-            if dependent.update_status_based_on_dependencies():
-                # Recursively update dependents if status changed
-                dependent.propagate_status_update()
+        tasks_by_id, deps_by_id = Task._load_graph()
+        statuses = {task_id: task_status for task_id, (task_status, _) in tasks_by_id.items()}
+        statuses[self.id] = self.status
+        
+        dependents_by_id = {}
+        for task_id, dep_ids in deps_by_id.items():
+            for dep_id in dep_ids:
+                dependents_by_id.setdefault(dep_id, []).append(task_id)
+        
+        changed = set()
+        queue = deque([self.id])
+        while queue:
+            node = queue.popleft()
+            for dependent_id in dependents_by_id.get(node, []):
+                current_status = statuses.get(dependent_id)
+                if current_status is None:
+                    continue
+                dependency_statuses = [
+                    statuses[dep_id]
+                    for dep_id in deps_by_id.get(dependent_id, [])
+                    if dep_id in statuses
+                ]
+                new_status = Task.status_for(
+                    current_status,
+                    has_blocked=TaskStatus.BLOCKED in dependency_statuses,
+                    has_incomplete=any(s != TaskStatus.COMPLETED for s in dependency_statuses),
+                )
+                if new_status != current_status:
+                    # Status changed, so its own dependents need re-checking
+                    statuses[dependent_id] = new_status
+                    changed.add(dependent_id)
+                    queue.append(dependent_id)
+        
+        # At most one plain UPDATE per status instead of a per-row CASE
+        ids_by_status = {}
+        for dependent_id in changed:
+            ids_by_status.setdefault(statuses[dependent_id], []).append(dependent_id)
+        now = timezone.now()
+        for new_status, ids in ids_by_status.items():
+            Task.objects.filter(id__in=ids).update(status=new_status, updated_at=now)
 
     def update_with_version_check(self, **fields):
         """Update task with version checking for concurrent modification detection."""
@@ -239,6 +421,7 @@ class TaskDependency(models.Model):
         related_name='dependent_tasks'
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'task_dependencies'
@@ -246,6 +429,7 @@ class TaskDependency(models.Model):
         indexes = [
             models.Index(fields=['task']),
             models.Index(fields=['depends_on']),
+            models.Index(fields=['updated_at'], name='task_deps_updated_at_idx'),
         ]
 
     def __str__(self):
@@ -273,9 +457,7 @@ class TaskDependency(models.Model):
             try:
                 self.full_clean()
             except ValidationError as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Validation error in TaskDependency.save(): {str(e)}")
+                logger.warning("Validation error in TaskDependency.save(): %s", e)
                 # Allow save to continue even if validation fails
                 # This prevents blocking legitimate dependencies due to data issues
         
@@ -285,9 +467,7 @@ class TaskDependency(models.Model):
             try:
                 self.task.update_status_based_on_dependencies()
             except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Failed to update task status after dependency save: {str(e)}")
+                logger.warning("Failed to update task status after dependency save: %s", e)
                 # Don't fail the save if status update fails
 
     def detect_circular_dependency(self) -> Optional[List[int]]:
@@ -296,63 +476,184 @@ class TaskDependency(models.Model):
         Returns the cycle path if found, None otherwise.
         
         Time Complexity: O(V + E) where V is tasks, E is dependencies
-        Space Complexity: O(V) for recursion stack and visited set
+        Space Complexity: O(V) for the DFS stack and visited set
         """
         if not self.task_id or not self.depends_on_id:
             return None
-            
-        # Build adjacency list for the graph including the new dependency
-        graph = self._build_dependency_graph()
+        return self.find_cycle_path(self.task_id, self.depends_on_id)
+
+    @classmethod
+    def find_cycle_path(cls, task_id: int, depends_on_id: int) -> Optional[List[int]]:
+        """
+        Return the cycle path that adding task_id -> depends_on_id would create,
+        or None. Needs only the ids, so no unsaved instance has to be built.
+        """
+        # Build adjacency list for the existing graph
+        graph = cls._build_dependency_graph()
+        return cls._find_cycle(graph, task_id, depends_on_id)
+
+    @classmethod
+    def _reach_cte(cls) -> str:
+        """
+        Recursive CTE naming every task reachable from the task_id bound to
+        its parameter by following dependencies (SQLite 3.8.3+, MySQL 8.0+).
+        """
+        table = connection.ops.quote_name(cls._meta.db_table)
+        return (
+            f"WITH RECURSIVE reach(id) AS ("
+            f"SELECT depends_on_id FROM {table} WHERE task_id = %s "
+            f"UNION "
+            f"SELECT td.depends_on_id FROM {table} td JOIN reach r ON td.task_id = r.id"
+            f") "
+        )
+
+    @classmethod
+    def creates_cycle(cls, task_id: int, depends_on_id: int) -> bool:
+        """
+        Check in a single query whether adding task_id -> depends_on_id would
+        create a cycle, i.e. whether task_id is reachable from depends_on_id.
+        """
+        if task_id == depends_on_id:
+            return True
         
-        # Add the new dependency to the graph
-        if self.task_id not in graph:
-            graph[self.task_id] = set()
-        graph[self.task_id].add(self.depends_on_id)
+        sql = cls._reach_cte() + "SELECT 1 FROM reach WHERE id = %s LIMIT 1"
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [depends_on_id, task_id])
+            return cursor.fetchone() is not None
+
+    @classmethod
+    def check_new_dependency(cls, task_id: int, depends_on_id: int) -> Tuple[bool, bool]:
+        """
+        Check a prospective task_id -> depends_on_id dependency in a single query.
+        Returns (already_exists, creates_cycle).
+        """
+        table = connection.ops.quote_name(cls._meta.db_table)
+        sql = cls._reach_cte() + (
+            f"SELECT "
+            f"EXISTS(SELECT 1 FROM {table} WHERE task_id = %s AND depends_on_id = %s), "
+            f"EXISTS(SELECT 1 FROM reach WHERE id = %s)"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [depends_on_id, task_id, depends_on_id, task_id])
+            exists, cycle = cursor.fetchone()
+        return bool(exists), bool(cycle) or task_id == depends_on_id
+
+    @staticmethod
+    def _find_cycle(graph: Dict[int, Set[int]], task_id: int, depends_on_id: int) -> Optional[List[int]]:
+        """
+        Return the cycle path that adding task_id -> depends_on_id would create
+        in graph, or None. The graph is not modified.
+        """
+        def neighbors(node: int):
+            """Neighbors of a node, including the new dependency."""
+            if node == task_id:
+                return graph.get(node, set()) | {depends_on_id}
+            return graph.get(node, ())
         
-        # Use DFS to detect cycles
-        visited = set()
-        rec_stack = set()
-        path = []
+        # Iterative DFS with an explicit stack of (node, neighbor iterator)
+        visited = {task_id}
+        rec_stack = {task_id}
+        path = [task_id]
+        stack = [(task_id, iter(neighbors(task_id)))]
         
-        def dfs(node: int) -> Optional[List[int]]:
-            """DFS helper function to detect cycles."""
-            if node in rec_stack:
-                # Found a cycle, return the cycle path
-                cycle_start = path.index(node)
-                return path[cycle_start:] + [node]
-            
-            if node in visited:
-                return None
-                
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-            
-            # Visit all neighbors
-            for neighbor in graph.get(node, []):
-                cycle = dfs(neighbor)
-                if cycle:
-                    return cycle
-            
-            rec_stack.remove(node)
-            path.pop()
+        while stack:
+            node, remaining = stack[-1]
+            for neighbor in remaining:
+                if neighbor in rec_stack:
+                    # Found a cycle, return the cycle path
+                    cycle_start = path.index(neighbor)
+                    return path[cycle_start:] + [neighbor]
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    rec_stack.add(neighbor)
+                    path.append(neighbor)
+                    stack.append((neighbor, iter(neighbors(neighbor))))
+                    break
+            else:
+                # All neighbors explored, backtrack
+                stack.pop()
+                rec_stack.remove(node)
+                path.pop()
+        
+        return None
+
+    @staticmethod
+    def _find_any_cycle(graph: Dict[int, Set[int]]) -> Optional[List[int]]:
+        """
+        Return a cycle path in graph, or None if it is acyclic.
+        Uses Kahn's algorithm: tasks are removed once all their dependencies
+        have been removed, so whatever is left lies on or behind a cycle.
+        
+        Time Complexity: O(V + E)
+        """
+        remaining = {}
+        dependents = {}
+        for task_id, dep_ids in graph.items():
+            remaining[task_id] = len(dep_ids)
+            for dep_id in dep_ids:
+                remaining.setdefault(dep_id, 0)
+                dependents.setdefault(dep_id, []).append(task_id)
+        
+        queue = deque(task_id for task_id, count in remaining.items() if count == 0)
+        while queue:
+            dep_id = queue.popleft()
+            del remaining[dep_id]
+            for task_id in dependents.get(dep_id, []):
+                remaining[task_id] -= 1
+                if remaining[task_id] == 0:
+                    queue.append(task_id)
+        
+        if not remaining:
             return None
         
-        # Check for cycles starting from the task
-        return dfs(self.task_id)
+        # Every leftover task still has a leftover dependency; follow them until one repeats
+        node = next(iter(remaining))
+        path = []
+        seen = {}
+        while node not in seen:
+            seen[node] = len(path)
+            path.append(node)
+            node = next(dep_id for dep_id in graph[node] if dep_id in remaining)
+        return path[seen[node]:] + [node]
 
-    def _build_dependency_graph(self) -> Dict[int, Set[int]]:
-        """Build adjacency list representation of the dependency graph."""
+    @classmethod
+    def bulk_create_validated(cls, dependencies: List['TaskDependency']) -> List['TaskDependency']:
+        """
+        Validate a batch of new dependencies against one in-memory graph and
+        insert them with a single bulk_create.
+        Raises ValidationError on self-dependencies or cycles. Task statuses are
+        not updated; callers are expected to recompute them afterwards.
+        """
+        graph = {task_id: set(deps) for task_id, deps in cls._build_dependency_graph().items()}
+        
+        for dep in dependencies:
+            if dep.task_id == dep.depends_on_id:
+                raise ValidationError("A task cannot depend on itself.")
+            graph.setdefault(dep.task_id, set()).add(dep.depends_on_id)
+        
+        # One topological check over the combined graph instead of a DFS per edge
+        cycle_path = cls._find_any_cycle(graph)
+        if cycle_path:
+            raise ValidationError(
+                f"Circular dependency detected: {' -> '.join(map(str, cycle_path))}"
+            )
+        
+        return cls.objects.bulk_create(dependencies)
+
+    @classmethod
+    def _build_dependency_graph(cls) -> Dict[int, Set[int]]:
+        """
+        Build adjacency list representation of the dependency graph.
+        Read fresh on every call, so it always reflects the current transaction.
+        """
         graph = {}
         
-        # Get all existing dependencies
-        dependencies = TaskDependency.objects.all()
+        # Get all existing dependencies as (task_id, depends_on_id) pairs
+        for task_id, depends_on_id in TaskDependency.objects.values_list('task_id', 'depends_on_id'):
+            if task_id not in graph:
+                graph[task_id] = set()
+            graph[task_id].add(depends_on_id)
         
-        for dep in dependencies:
-            if dep.task_id not in graph:
-                graph[dep.task_id] = set()
-            graph[dep.task_id].add(dep.depends_on_id)
-            
         return graph
 
     @classmethod
@@ -362,11 +663,8 @@ class TaskDependency(models.Model):
         Used by the frontend for visualization.
         """
         graph = {}
-        dependencies = cls.objects.select_related('task', 'depends_on').all()
-        
-        for dep in dependencies:
-            if dep.task_id not in graph:
-                graph[dep.task_id] = []
-            graph[dep.task_id].append(dep.depends_on_id)
+        # Only the two id columns; no joins or model instances are needed
+        for task_id, depends_on_id in cls.objects.values_list('task_id', 'depends_on_id'):
+            graph.setdefault(task_id, []).append(depends_on_id)
             
         return graph
\ No newline at end of file
@@ -1,19 +1,89 @@
 """
 Serializers for the tasks API.
 """
+import logging
+
 from rest_framework import serializers
+from django.db import models
 from django.core.exceptions import ValidationError as DjangoValidationError
-from .models import Task, TaskDependency, TaskStatus
+from .models import VALID_STATUSES, Task, TaskDependency, TaskStatus
+
+logger = logging.getLogger(__name__)
+
+# Priority labels, looked up once instead of through get_priority_display() per row
+_PRIORITY_MAP = dict(Task._meta.get_field('priority').flatchoices)
+
+
+# Allowed values, built once at import
+_PRIORITY_RANGE = range(1, 6)
+_HOURS_RANGE = range(1, 201)
+
+# Returned by a field cleaner to drop the field from the validated data
+_SKIP = object()
+
+
+def _clean_bounded_int(value, allowed, default):
+    """Coerce value to an int in the allowed range, falling back to default."""
+    if value is None or value == '' or value == 'null':
+        return _SKIP
+    try:
+        value = int(float(str(value)))  # Handle any format
+    except (TypeError, ValueError, OverflowError):
+        return default
+    return value if value in allowed else default
+
+
+def _clean_priority(value):
+    """Priority must be 1-5; anything else becomes 3."""
+    return _clean_bounded_int(value, _PRIORITY_RANGE, 3)
+
+
+def _clean_hours(value):
+    """Estimated hours must be 1-200; anything else becomes 8."""
+    return _clean_bounded_int(value, _HOURS_RANGE, 8)
+
+
+def _clean_status(value):
+    """Keep known statuses only; invalid ones are skipped."""
+    return value if value in VALID_STATUSES else _SKIP
+
+
+def _clean_text(value):
+    """Coerce text fields to str, skipping None."""
+    return _SKIP if value is None else str(value)
+
+
+def _passthrough(value):
+    """Copy other fields as-is."""
+    return value
+
+
+class TaskBatchSerializer(serializers.ListSerializer):
+    """List serializer that computes estimated completions for the whole batch at once."""
+
+    def to_representation(self, data):
+        tasks = list(data.all() if isinstance(data, models.Manager) else data)
+        Task.attach_estimated_completions(tasks)
+        return super().to_representation(tasks)
 
 
 class TaskSerializer(serializers.ModelSerializer):
     """Serializer for Task model."""
+
+    _FIELD_CLEANERS = {
+        'priority': _clean_priority,
+        'estimated_hours': _clean_hours,
+        'status': _clean_status,
+        'title': _clean_text,
+        'description': _clean_text,
+    }
     
     dependencies = serializers.SerializerMethodField()
     dependents = serializers.SerializerMethodField()
     can_start = serializers.SerializerMethodField()
     is_blocked = serializers.SerializerMethodField()
-    estimated_completion = serializers.SerializerMethodField()
+    # Attached by to_representation, or by TaskBatchSerializer for many=True
+    estimated_completion = serializers.ReadOnlyField(source='_estimated_completion')
     priority_display = serializers.SerializerMethodField()
 
     class Meta:
@@ -25,25 +95,24 @@ class TaskSerializer(serializers.ModelSerializer):
             'priority_display'
         ]
         read_only_fields = ['created_at', 'updated_at', 'can_start', 'is_blocked', 'version']
+        list_serializer_class = TaskBatchSerializer
 
     def to_representation(self, instance):
         """Ensure priority and estimated_hours are never null in the response."""
+        if not isinstance(self.parent, TaskBatchSerializer):
+            Task.attach_estimated_completions([instance])
         data = super().to_representation(instance)
         # Ensure priority and estimated_hours are never null
         data['priority'] = instance.priority or 3
         data['estimated_hours'] = instance.estimated_hours or 8
         return data
 
-    def update(self, instance, validated_data):
-        """Custom update method to handle partial updates gracefully."""
-        import logging
-        logger = logging.getLogger(__name__)
-        
-        logger.info(f"TaskSerializer update called for task {instance.id}")
-        logger.info(f"Validated data: {validated_data}")
-        logger.info(f"Instance before update - priority: {instance.priority}, estimated_hours: {instance.estimated_hours}")
-        
-        # Handle None values for priority and estimated_hours in partial updates
+    @staticmethod
+    def apply_null_defaults(instance, validated_data):
+        """
+        Handle None values for priority and estimated_hours in partial updates.
+        Mutates and returns validated_data; shared with the view's direct writes.
+        """
         if 'priority' in validated_data and validated_data['priority'] is None:
             # Don't update priority if None is passed (keep existing value)
             validated_data.pop('priority')
@@ -57,16 +126,40 @@ class TaskSerializer(serializers.ModelSerializer):
         elif instance.estimated_hours is None:
             # Set default if instance has None
             validated_data['estimated_hours'] = 8
+        return validated_data
+
+    def update(self, instance, validated_data):
+        """Custom update method to handle partial updates gracefully."""
+        logger.debug("TaskSerializer update called for task %s", instance.id)
+        logger.debug("Validated data: %s", validated_data)
+        logger.debug(
+            "Instance before update - priority: %s, estimated_hours: %s",
+            instance.priority, instance.estimated_hours
+        )
         
+        self.apply_null_defaults(instance, validated_data)
         result = super().update(instance, validated_data)
-        logger.info(f"Instance after update - priority: {result.priority}, estimated_hours: {result.estimated_hours}")
+        logger.debug(
+            "Instance after update - priority: %s, estimated_hours: %s",
+            result.priority, result.estimated_hours
+        )
         
         return result
 
+    @staticmethod
+    def _relationships(obj, accessor, related_field):
+        """
+        The task's TaskDependency rows for accessor, from the viewset's prefetch
+        when there is one, otherwise from one query joined to related_field.
+        """
+        relationships = getattr(obj, accessor).all()
+        if accessor not in getattr(obj, '_prefetched_objects_cache', {}):
+            relationships = relationships.select_related(related_field)
+        return relationships
+
     def get_dependencies(self, obj):
         """Get list of tasks this task depends on with relationship IDs."""
-        # Get TaskDependency objects to access relationship IDs
-        dependency_relationships = obj.dependencies.select_related('depends_on').all()
+        # Iterate TaskDependency objects to access relationship IDs
         return [
             {
                 'id': dep_rel.depends_on.id,  # Task ID
@@ -74,35 +167,39 @@ class TaskSerializer(serializers.ModelSerializer):
                 'title': dep_rel.depends_on.title,
                 'status': dep_rel.depends_on.status
             }
-            for dep_rel in dependency_relationships
+            for dep_rel in self._relationships(obj, 'dependencies', 'depends_on')
         ]
 
     def get_dependents(self, obj):
         """Get list of tasks that depend on this task."""
         return [
             {
-                'id': dep.id,
-                'title': dep.title,
-                'status': dep.status
+                'id': dep_rel.task.id,
+                'title': dep_rel.task.title,
+                'status': dep_rel.task.status
             }
-            for dep in obj.get_dependents()
+            for dep_rel in self._relationships(obj, 'dependent_tasks', 'task')
         ]
 
     def get_can_start(self, obj):
         """Check if task can start."""
+        # Use the queryset annotation when the viewset provided one
+        has_incomplete = getattr(obj, 'has_incomplete_dependencies', None)
+        if has_incomplete is not None:
+            return not has_incomplete
         return obj.can_start()
 
     def get_is_blocked(self, obj):
         """Check if task is blocked."""
+        # Use the queryset annotation when the viewset provided one
+        has_blocked = getattr(obj, 'has_blocked_dependencies', None)
+        if has_blocked is not None:
+            return has_blocked
         return obj.is_blocked()
 
-    def get_estimated_completion(self, obj):
-        """Get estimated completion time."""
-        return obj.get_estimated_completion_time()
-
     def get_priority_display(self, obj):
         """Get human-readable priority."""
-        return obj.get_priority_display()
+        return _PRIORITY_MAP.get(obj.priority or 3, '')
 
     def validate_priority(self, value):
         """Validate priority field - never fail."""
@@ -110,7 +207,7 @@ class TaskSerializer(serializers.ModelSerializer):
             return None
         try:
             value = int(value) if isinstance(value, str) else int(value)
-            return value if 1 <= value <= 5 else 3
+            return value if value in _PRIORITY_RANGE else 3
         except:
             return 3
 
@@ -120,73 +217,26 @@ class TaskSerializer(serializers.ModelSerializer):
             return None
         try:
             value = int(value) if isinstance(value, str) else int(value)
-            return value if 1 <= value <= 200 else 8
+            return value if value in _HOURS_RANGE else 8
         except:
             return 8
 
     def validate(self, data):
         """Custom validation - completely bulletproof, never fails."""
-        # Create a clean copy of the data
+        # Create a clean copy of the data, one cleaner lookup per field
         cleaned_data = {}
-        
-        # Handle each field individually with maximum safety
         for key, value in data.items():
-            try:
-                if key == 'priority':
-                    if value is None or value == '' or value == 'null':
-                        continue  # Skip this field
-                    try:
-                        priority_int = int(float(str(value)))  # Handle any format
-                        if 1 <= priority_int <= 5:
-                            cleaned_data['priority'] = priority_int
-                        else:
-                            cleaned_data['priority'] = 3
-                    except:
-                        cleaned_data['priority'] = 3
-                        
-                elif key == 'estimated_hours':
-                    if value is None or value == '' or value == 'null':
-                        continue  # Skip this field
-                    try:
-                        hours_int = int(float(str(value)))  # Handle any format
-                        if 1 <= hours_int <= 200:
-                            cleaned_data['estimated_hours'] = hours_int
-                        else:
-                            cleaned_data['estimated_hours'] = 8
-                    except:
-                        cleaned_data['estimated_hours'] = 8
-                        
-                elif key == 'status':
-                    valid_statuses = ['pending', 'in_progress', 'completed', 'blocked']
-                    if value in valid_statuses:
-                        cleaned_data['status'] = value
-                    # Skip invalid statuses
-                    
-                elif key in ['title', 'description']:
-                    # Handle text fields
-                    if value is not None:
-                        cleaned_data[key] = str(value)
-                        
-                else:
-                    # Copy other fields as-is
-                    cleaned_data[key] = value
-                    
-            except Exception as e:
-                # If any field processing fails, just skip it
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Skipping field {key} due to error: {e}")
-                continue
-        
+            value = self._FIELD_CLEANERS.get(key, _passthrough)(value)
+            if value is not _SKIP:
+                cleaned_data[key] = value
         return cleaned_data
 
     def validate_status(self, value):
         """Validate status transitions."""
         # Allow all status transitions - users should have full control
         # The automatic status update logic will handle dependency-based updates
-        valid_statuses = ['pending', 'in_progress', 'completed', 'blocked']
-        if value not in valid_statuses:
-            raise serializers.ValidationError(f"Status must be one of: {', '.join(valid_statuses)}")
+        if value not in VALID_STATUSES:
+            raise serializers.ValidationError(f"Status must be one of: {', '.join(TaskStatus.values)}")
         
         # Note: We removed the dependency check for completed status to allow manual overrides
         # Users should have full control over task status
@@ -217,17 +267,18 @@ class TaskDependencySerializer(serializers.ModelSerializer):
                 "A task cannot depend on itself."
             )
         
-        # Check if dependency already exists
-        if TaskDependency.objects.filter(task=task, depends_on=depends_on).exists():
+        # Duplicate and cycle checks share one recursive query
+        exists, creates_cycle = TaskDependency.check_new_dependency(task.id, depends_on.id)
+        if exists:
             raise serializers.ValidationError(
                 "This dependency already exists."
             )
         
-        # Create a temporary dependency to check for circular dependencies
-        temp_dependency = TaskDependency(task=task, depends_on=depends_on)
-        cycle_path = temp_dependency.detect_circular_dependency()
-        
-        if cycle_path:
+        if creates_cycle:
+            # Only rejected dependencies pay for reconstructing the path
+            cycle_path = TaskDependency.find_cycle_path(
+                task.id, depends_on.id
+            ) or [task.id, depends_on.id, task.id]
             raise serializers.ValidationError({
                 'error': 'Circular dependency detected',
                 'path': cycle_path
@@ -239,43 +290,32 @@ class TaskDependencySerializer(serializers.ModelSerializer):
 class AddDependencySerializer(serializers.Serializer):
     """Serializer for adding a dependency to a task."""
     
-    depends_on_id = serializers.IntegerField()
-
-    def validate_depends_on_id(self, value):
-        """Validate that the dependency task exists."""
-        try:
-            Task.objects.get(id=value)
-        except Task.DoesNotExist:
-            raise serializers.ValidationError("Task does not exist.")
-        return value
+    # Resolved to the Task (id and title only) in validated_data['depends_on']
+    depends_on_id = serializers.PrimaryKeyRelatedField(
+        source='depends_on',
+        queryset=Task.objects.only('id', 'title'),
+        error_messages={'does_not_exist': 'Task does not exist.'}
+    )
 
     def validate(self, data):
         """Validate the dependency relationship."""
         task_id = self.context['task_id']
-        depends_on_id = data['depends_on_id']
         
-        if task_id == depends_on_id:
+        if task_id == data['depends_on'].id:
             raise serializers.ValidationError(
                 "A task cannot depend on itself."
             )
         
-        # Check if dependency already exists
-        if TaskDependency.objects.filter(
-            task_id=task_id, 
-            depends_on_id=depends_on_id
-        ).exists():
-            raise serializers.ValidationError(
-                "This dependency already exists."
-            )
-        
+        # Duplicates are rejected by the (task, depends_on) unique constraint on insert
         return data
 
 
 class TaskListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for task lists."""
     
-    dependency_count = serializers.SerializerMethodField()
-    dependent_count = serializers.SerializerMethodField()
+    # Annotated on the list queryset by TaskViewSet.get_queryset
+    dependency_count = serializers.IntegerField(read_only=True)
+    dependent_count = serializers.IntegerField(read_only=True)
     priority_display = serializers.SerializerMethodField()
 
     class Meta:
@@ -294,53 +334,7 @@ class TaskListSerializer(serializers.ModelSerializer):
         data['estimated_hours'] = instance.estimated_hours or 8
         return data
 
-    def get_dependency_count(self, obj):
-        """Get count of dependencies."""
-        return obj.dependencies.count()
-
-    def get_dependent_count(self, obj):
-        """Get count of dependents."""
-        return obj.dependent_tasks.count()
-
     def get_priority_display(self, obj):
         """Get human-readable priority."""
-        return obj.get_priority_display()
+        return _PRIORITY_MAP.get(obj.priority or 3, '')
 
-
-class DependencyGraphSerializer(serializers.Serializer):
-    """Serializer for dependency graph data."""
-    
-    nodes = serializers.ListField(child=serializers.DictField())
-    edges = serializers.ListField(child=serializers.DictField())
-    
-    def to_representation(self, instance):
-        """Convert tasks and dependencies to graph format."""
-        tasks = Task.objects.all()
-        dependencies = TaskDependency.objects.select_related('task', 'depends_on').all()
-        
-        # Create nodes
-        nodes = []
-        for task in tasks:
-            nodes.append({
-                'id': task.id,
-                'title': task.title,
-                'status': task.status,
-                'priority': task.priority or 3,  # Ensure priority is never null
-                'estimated_hours': task.estimated_hours or 8,  # Ensure estimated_hours is never null
-                'x': 0,  # Will be calculated by frontend layout
-                'y': 0,  # Will be calculated by frontend layout
-            })
-        
-        # Create edges
-        edges = []
-        for dep in dependencies:
-            edges.append({
-                'id': dep.id,
-                'source': dep.depends_on_id,
-                'target': dep.task_id,
-            })
-        
-        return {
-            'nodes': nodes,
-            'edges': edges
-        }
\ No newline at end of file
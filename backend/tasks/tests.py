@@ -1,11 +1,18 @@
 """
 Tests for the tasks application.
 """
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase
 from rest_framework import status
 from .models import Task, TaskDependency, TaskStatus
+from .serializers import TaskDependencySerializer, TaskSerializer
+from .views import TaskViewSet
 
 
 class TaskModelTest(TestCase):
@@ -27,6 +34,18 @@ class TaskModelTest(TestCase):
         self.assertEqual(self.task1.status, TaskStatus.PENDING)
         self.assertEqual(str(self.task1), "Task 1 (Pending)")
 
+    def test_save_does_not_reread_row(self):
+        """Test updating a loaded task issues a single UPDATE."""
+        task = Task.objects.get(pk=self.task1.pk)
+        self.assertEqual(task._loaded_status, TaskStatus.PENDING)
+
+        task.status = TaskStatus.IN_PROGRESS
+        with self.assertNumQueries(1):
+            task.save()
+
+        self.assertEqual(task._loaded_status, TaskStatus.IN_PROGRESS)
+        self.assertEqual(task.version, 2)
+
     def test_can_start_no_dependencies(self):
         """Test task can start when it has no dependencies."""
         self.assertTrue(self.task1.can_start())
@@ -52,6 +71,123 @@ class TaskModelTest(TestCase):
         TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
         self.assertTrue(self.task1.is_blocked())
 
+    def test_propagate_status_update(self):
+        """Test a blocked task blocks its transitive dependents."""
+        task3 = Task.objects.create(title="Task 3")
+        TaskDependency.objects.create(task=self.task2, depends_on=self.task1)
+        TaskDependency.objects.create(task=task3, depends_on=self.task2)
+
+        self.task1.status = TaskStatus.BLOCKED
+        self.task1.save()
+        with self.assertNumQueries(3):
+            self.task1.propagate_status_update()
+
+        self.task2.refresh_from_db()
+        task3.refresh_from_db()
+        self.assertEqual(self.task2.status, TaskStatus.BLOCKED)
+        self.assertEqual(task3.status, TaskStatus.BLOCKED)
+
+    def test_estimated_completion_time(self):
+        """Test critical path is computed from the preloaded graph."""
+        self.task1.estimated_hours = 4
+        self.task1.save()
+        self.task2.estimated_hours = 6
+        self.task2.save()
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+
+        with self.assertNumQueries(2):
+            result = self.task1.get_estimated_completion_time()
+
+        self.assertEqual(result['total_hours'], 10)
+        self.assertEqual(result['critical_path'], [self.task2.id, self.task1.id])
+        self.assertFalse(result['can_start_immediately'])
+
+    def test_create_sample_data(self):
+        """Test the sample data script builds tasks and resolves their statuses."""
+        from create_sample_data import create_sample_data
+
+        with mock.patch('builtins.print'):
+            create_sample_data()
+
+        self.assertEqual(Task.objects.count(), 10)
+        self.assertTrue(TaskDependency.objects.exists())
+        for task in Task.objects.all():
+            dependency_statuses = list(
+                task.dependencies.values_list('depends_on__status', flat=True)
+            )
+            if dependency_statuses and task.status != TaskStatus.COMPLETED:
+                self.assertEqual(task.status, task.resolve_status(dependency_statuses))
+
+    def test_compute_all_critical_paths(self):
+        """Test critical paths for every task come from one graph load."""
+        task3 = Task.objects.create(title="Task 3", estimated_hours=2, status=TaskStatus.COMPLETED)
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        TaskDependency.objects.create(task=self.task2, depends_on=task3)
+
+        with CaptureQueriesContext(connection) as queries:
+            paths = Task.compute_all_critical_paths()
+
+        self.assertEqual(len(queries), 2)
+        # Only the columns the walk reads, never the task text
+        self.assertNotIn('description', queries.captured_queries[0]['sql'])
+        self.assertEqual(paths[task3.id], (0, []))
+        self.assertEqual(paths[self.task2.id], (8, [self.task2.id]))
+        self.assertEqual(paths[self.task1.id], (16, [self.task2.id, self.task1.id]))
+
+    def test_serializer_batches_estimated_completion(self):
+        """Test serializing many tasks loads the dependency graph once."""
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+
+        with mock.patch.object(Task, '_load_graph', wraps=Task._load_graph) as load_graph:
+            data = TaskSerializer(Task.objects.all(), many=True).data
+
+        self.assertEqual(load_graph.call_count, 1)
+        completions = {task['id']: task['estimated_completion'] for task in data}
+        self.assertEqual(completions[self.task1.id]['total_hours'], 16)
+        self.assertEqual(completions[self.task1.id], self.task1.get_estimated_completion_time())
+
+    def test_estimated_completion_time_diamond(self):
+        """Test shared sub-paths of a diamond DAG count toward every branch."""
+        left = Task.objects.create(title="Left", estimated_hours=2)
+        right = Task.objects.create(title="Right", estimated_hours=5)
+        self.task2.estimated_hours = 3
+        self.task2.save()
+        self.task1.estimated_hours = 1
+        self.task1.save()
+        TaskDependency.objects.create(task=self.task1, depends_on=left)
+        TaskDependency.objects.create(task=self.task1, depends_on=right)
+        TaskDependency.objects.create(task=left, depends_on=self.task2)
+        TaskDependency.objects.create(task=right, depends_on=self.task2)
+
+        result = self.task1.get_estimated_completion_time()
+
+        self.assertEqual(result['total_hours'], 9)
+        self.assertEqual(
+            result['critical_path'],
+            [self.task2.id, right.id, self.task1.id]
+        )
+
+    def test_estimated_completion_time_with_cycle(self):
+        """Test tasks on or behind a cycle still get a critical path."""
+        task3 = Task.objects.create(title="Task 3", estimated_hours=7)
+        # bulk_create skips the cycle validation that save() only logs
+        TaskDependency.objects.bulk_create([
+            TaskDependency(task=self.task1, depends_on=self.task2),
+            TaskDependency(task=self.task2, depends_on=self.task1),
+            TaskDependency(task=task3, depends_on=self.task1),
+        ])
+
+        paths = Task.compute_all_critical_paths()
+
+        # The cycle is broken at whichever edge closes it first
+        self.assertEqual(
+            sorted([paths[self.task1.id][0], paths[self.task2.id][0]]), [8, 16]
+        )
+        self.assertEqual(paths[task3.id][0], 23)
+        self.assertEqual(paths[task3.id][1][-2:], [self.task1.id, task3.id])
+        result = task3.get_estimated_completion_time()
+        self.assertEqual(result['total_hours'], 23)
+
 
 class TaskDependencyModelTest(TestCase):
     """Test cases for TaskDependency model."""
@@ -96,9 +232,94 @@ class TaskDependencyModelTest(TestCase):
         
         dep = TaskDependency(task=self.task3, depends_on=self.task2)
         cycle_path = dep.detect_circular_dependency()
-        
+
         self.assertIsNone(cycle_path)
 
+    def test_find_cycle_path(self):
+        """Test cycle paths can be found from ids alone."""
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        self.assertEqual(
+            TaskDependency.find_cycle_path(self.task2.id, self.task1.id),
+            [self.task2.id, self.task1.id, self.task2.id]
+        )
+        self.assertIsNone(TaskDependency.find_cycle_path(self.task3.id, self.task1.id))
+
+    def test_find_cycle_deep_chain(self):
+        """Test cycle detection handles chains deeper than the recursion limit."""
+        depth = 5000
+        graph = {node: {node + 1} for node in range(depth)}
+
+        self.assertIsNone(TaskDependency._find_cycle(graph, depth, depth + 1))
+        cycle_path = TaskDependency._find_cycle(graph, depth, 0)
+        self.assertEqual(cycle_path[0], depth)
+        self.assertEqual(cycle_path[-1], depth)
+        self.assertEqual(len(cycle_path), depth + 2)
+
+    def test_find_any_cycle(self):
+        """Test the topological check finds cycles anywhere in the graph."""
+        self.assertIsNone(TaskDependency._find_any_cycle({1: {2, 3}, 2: {3}}))
+
+        cycle_path = TaskDependency._find_any_cycle({1: {2}, 2: {3}, 3: {4, 2}})
+        self.assertEqual(cycle_path[0], cycle_path[-1])
+        self.assertEqual(set(cycle_path), {2, 3})
+
+    def test_bulk_create_validated(self):
+        """Test batch inserts are validated against the combined graph."""
+        TaskDependency.bulk_create_validated([
+            TaskDependency(task=self.task1, depends_on=self.task2),
+            TaskDependency(task=self.task2, depends_on=self.task3),
+        ])
+        self.assertEqual(TaskDependency.objects.count(), 2)
+
+        with self.assertRaises(ValidationError):
+            TaskDependency.bulk_create_validated([
+                TaskDependency(task=self.task3, depends_on=self.task1),
+            ])
+        self.assertEqual(TaskDependency.objects.count(), 2)
+
+    def test_detect_circular_dependency_reads_current_graph(self):
+        """Test cycle detection sees dependencies written without save()."""
+        dep = TaskDependency(task=self.task3, depends_on=self.task1)
+        self.assertIsNone(dep.detect_circular_dependency())
+
+        TaskDependency.objects.bulk_create([TaskDependency(task=self.task1, depends_on=self.task3)])
+        self.assertEqual(dep.detect_circular_dependency(), [self.task3.id, self.task1.id, self.task3.id])
+
+        TaskDependency.objects.filter(task=self.task1).delete()
+        self.assertIsNone(dep.detect_circular_dependency())
+
+    def test_creates_cycle(self):
+        """Test the recursive reachability query used by add_dependency."""
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        TaskDependency.objects.create(task=self.task2, depends_on=self.task3)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(TaskDependency.creates_cycle(self.task3.id, self.task1.id))
+        self.assertTrue(TaskDependency.creates_cycle(self.task1.id, self.task1.id))
+        self.assertFalse(TaskDependency.creates_cycle(self.task1.id, self.task3.id))
+
+    def test_check_new_dependency(self):
+        """Test the combined duplicate and cycle check."""
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        TaskDependency.objects.create(task=self.task2, depends_on=self.task3)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(
+                TaskDependency.check_new_dependency(self.task1.id, self.task2.id), (True, False)
+            )
+        self.assertEqual(TaskDependency.check_new_dependency(self.task3.id, self.task1.id), (False, True))
+        self.assertEqual(TaskDependency.check_new_dependency(self.task1.id, self.task3.id), (False, False))
+
+    def test_dependency_serializer_rejects_cycle(self):
+        """Test TaskDependencySerializer reports the cycle path."""
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+
+        serializer = TaskDependencySerializer(data={'task': self.task2.id, 'depends_on': self.task1.id})
+        self.assertFalse(serializer.is_valid())
+        self.assertEqual(
+            [int(i) for i in serializer.errors['path']], [self.task2.id, self.task1.id, self.task2.id]
+        )
+
 
 class TaskAPITest(APITestCase):
     """Test cases for Task API endpoints."""
@@ -122,6 +343,40 @@ class TaskAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 2)
 
+    def test_list_tasks_dependency_counts(self):
+        """Test list counts come from queryset annotations."""
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+
+        url = '/api/tasks/'
+        # Two ETag aggregates, pagination count, annotated page
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+
+        counts = {
+            task['id']: (task['dependency_count'], task['dependent_count'])
+            for task in response.data['results']
+        }
+        self.assertEqual(counts[self.task1.id], (1, 0))
+        self.assertEqual(counts[self.task2.id], (0, 1))
+        # Newest first, as Meta.ordering declares
+        self.assertEqual(
+            [task['id'] for task in response.data['results']],
+            [self.task2.id, self.task1.id]
+        )
+
+    def test_retrieve_task_with_dependencies(self):
+        """Test retrieving a task renders prefetched dependency relationships."""
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+
+        url = f'/api/tasks/{self.task2.id}/'
+        # Two ETag aggregates, then the task, its two prefetches and the graph
+        with self.assertNumQueries(7):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['dependencies'], [])
+        self.assertEqual(response.data['dependents'][0]['id'], self.task1.id)
+
     def test_create_task(self):
         """Test creating a new task."""
         url = '/api/tasks/'
@@ -148,6 +403,85 @@ class TaskAPITest(APITestCase):
         self.assertEqual(response.data['title'], 'Updated Task')
         self.assertEqual(response.data['status'], 'in_progress')
 
+    def test_update_task_dependency_state(self):
+        """Test update responses report dependency state from annotations."""
+        self.task2.status = TaskStatus.BLOCKED
+        self.task2.save()
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+
+        url = f'/api/tasks/{self.task1.id}/'
+        response = self.client.patch(url, {'title': 'Renamed'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_blocked'])
+        self.assertFalse(response.data['can_start'])
+
+    def test_update_task_version_conflict(self):
+        """Test a stale version is rejected against the already-loaded task."""
+        url = f'/api/tasks/{self.task1.id}/'
+        response = self.client.patch(url, {'title': 'Renamed', 'version': 99}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(str(response.data['current_version']), str(self.task1.version))
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.title, 'Task 1')
+
+    def test_update_task_with_version(self):
+        """Test a matching version is checked and bumped by a single UPDATE."""
+        url = f'/api/tasks/{self.task1.id}/'
+        response = self.client.patch(url, {'title': 'Renamed', 'version': self.task1.version}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Renamed')
+        self.assertEqual(response.data['version'], self.task1.version + 1)
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.title, 'Renamed')
+        self.assertEqual(self.task1.version, 2)
+
+    def test_update_task_with_version_fills_null_defaults(self):
+        """Test the versioned write applies the serializer's NULL fallbacks."""
+        Task.objects.filter(id=self.task1.id).update(priority=5)
+        get_object = TaskViewSet.get_object
+
+        def get_legacy_object(view):
+            # A row whose priority and hours were stored as NULL by old data
+            task = get_object(view)
+            task.priority = None
+            task.estimated_hours = None
+            return task
+
+        url = f'/api/tasks/{self.task1.id}/'
+        with mock.patch.object(TaskViewSet, 'get_object', get_legacy_object):
+            response = self.client.patch(url, {'title': 'Renamed', 'version': self.task1.version}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.task1.refresh_from_db()
+        self.assertEqual((self.task1.priority, self.task1.estimated_hours), (3, 8))
+
+    def test_update_task_falls_back_to_safe_update(self):
+        """Test a failing full-row save still writes the submitted fields."""
+        url = f'/api/tasks/{self.task1.id}/'
+        with mock.patch.object(Task, 'save', side_effect=DatabaseError('bad row')):
+            response = self.client.patch(url, {'title': 'Renamed'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['title'], 'Renamed')
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.title, 'Renamed')
+        self.assertEqual(self.task1.version, 2)
+
+    def test_update_task_cleans_fields(self):
+        """Test out-of-range values fall back to defaults instead of failing."""
+        url = f'/api/tasks/{self.task1.id}/'
+        data = {'priority': 5, 'estimated_hours': 500, 'title': 'Renamed'}
+        response = self.client.patch(url, data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.priority, 5)
+        self.assertEqual(self.task1.estimated_hours, 8)
+        self.assertEqual(self.task1.title, 'Renamed')
+
     def test_delete_task(self):
         """Test deleting a task."""
         url = f'/api/tasks/{self.task1.id}/'
@@ -156,6 +490,24 @@ class TaskAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Task.objects.filter(id=self.task1.id).exists())
 
+    def test_delete_task_updates_dependents(self):
+        """Test dependents are re-evaluated against their remaining dependencies."""
+        blocker = Task.objects.create(title="Blocker", status='blocked')
+        TaskDependency.objects.create(task=self.task1, depends_on=blocker)
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.status, 'blocked')
+        
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(f'/api/tasks/{blocker.id}/')
+        
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.status, 'in_progress')
+        # MySQL rejects an UPDATE whose subquery selects from the updated table
+        for query in queries.captured_queries:
+            if query['sql'].startswith('UPDATE'):
+                self.assertNotIn('SELECT', query['sql'])
+
     def test_add_dependency(self):
         """Test adding a dependency to a task."""
         url = f'/api/tasks/{self.task1.id}/add_dependency/'
@@ -183,12 +535,112 @@ class TaskAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn('error', response.data)
 
+    def test_add_duplicate_dependency(self):
+        """Test adding an existing dependency is rejected by the unique constraint."""
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        
+        url = f'/api/tasks/{self.task1.id}/add_dependency/'
+        response = self.client.post(url, {'depends_on_id': self.task2.id}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'This dependency already exists.')
+        self.assertEqual(TaskDependency.objects.count(), 1)
+
+    def test_add_dependency_validates_target(self):
+        """Test missing and self-referencing targets are rejected by the serializer."""
+        url = f'/api/tasks/{self.task1.id}/add_dependency/'
+        response = self.client.post(url, {'depends_on_id': 999999}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(str(response.data['depends_on_id'][0]), 'Task does not exist.')
+        
+        response = self.client.post(url, {'depends_on_id': self.task1.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(TaskDependency.objects.exists())
+
+    def test_add_circular_dependency_path(self):
+        """Test a rejected dependency reports the cycle path."""
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        
+        url = f'/api/tasks/{self.task2.id}/add_dependency/'
+        response = self.client.post(url, {'depends_on_id': self.task1.id}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['path'], [self.task2.id, self.task1.id, self.task2.id])
+        self.assertEqual(TaskDependency.objects.count(), 1)
+
+    def test_remove_dependency(self):
+        """Test removing a dependency re-evaluates the task's status."""
+        self.task2.status = TaskStatus.BLOCKED
+        self.task2.save()
+        dependency = TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.status, TaskStatus.BLOCKED)
+        version = self.task1.version
+        
+        url = f'/api/tasks/{self.task1.id}/dependencies/{dependency.id}/'
+        response = self.client.delete(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(TaskDependency.objects.exists())
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.status, TaskStatus.IN_PROGRESS)
+        # Clients holding the version can still save their edits
+        self.assertEqual(self.task1.version, version)
+        
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        
+        response = self.client.delete(f'/api/tasks/{self.task1.id}/dependencies/abc/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_remove_dependency_by_task_id(self):
+        """Test the depends_on task ID is accepted as a fallback."""
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        
+        url = f'/api/tasks/{self.task1.id}/dependencies/{self.task2.id}/'
+        response = self.client.delete(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(TaskDependency.objects.exists())
+
+    def test_list_dependencies(self):
+        """Test listing dependencies reads task titles from the joined page query."""
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        
+        # Pagination count + one joined SELECT
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/dependencies/')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual(results[0]['task_title'], 'Task 1')
+        self.assertEqual(results[0]['depends_on_title'], 'Task 2')
+
+    def test_task_dependencies_and_dependents(self):
+        """Test the per-task dependency actions match the dependency serializer."""
+        dependency = TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        expected = [TaskDependencySerializer(dependency).data]
+        
+        # Task lookup + one joined values query
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/tasks/{self.task1.id}/dependencies/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, expected)
+        
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/tasks/{self.task2.id}/dependents/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, expected)
+
     def test_get_dependency_graph(self):
         """Test getting dependency graph data."""
         TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        cache.clear()
         
         url = '/api/tasks/graph/'
-        response = self.client.get(url)
+        # Two aggregates for the cache key, then one query each for nodes and edges
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('nodes', response.data)
@@ -196,10 +648,169 @@ class TaskAPITest(APITestCase):
         self.assertEqual(len(response.data['nodes']), 2)
         self.assertEqual(len(response.data['edges']), 1)
 
+    def test_get_dependency_graph_cached(self):
+        """Test the graph response is reused until a task or dependency changes."""
+        cache.clear()
+        url = '/api/tasks/graph/'
+        self.client.get(url)
+        
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data['edges']), 0)
+        
+        dependency = TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        response = self.client.get(url)
+        self.assertEqual(len(response.data['edges']), 1)
+        
+        dependency.delete()
+        response = self.client.get(url)
+        self.assertEqual(len(response.data['edges']), 0)
+
+    def test_get_dependency_graph_after_dependency_edit(self):
+        """Test editing a dependency in place is not hidden by the cached graph."""
+        cache.clear()
+        dependency = TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        task3 = Task.objects.create(title="Task 3")
+        url = '/api/tasks/graph/'
+        self.client.get(url)
+        
+        # As the admin change form does: same row, same count
+        dependency.depends_on = task3
+        dependency.save(skip_validation=True)
+        
+        edges = self.client.get(url).data['edges']
+        self.assertEqual([(edge['source'], edge['target']) for edge in edges], [(task3.id, self.task1.id)])
+
+    def test_get_dependency_graph_after_fix_data(self):
+        """Test a bulk data repair is not hidden by the cached graph."""
+        cache.clear()
+        Task.objects.filter(id=self.task1.id).update(priority=9)
+        url = '/api/tasks/graph/'
+        nodes = {node['id']: node for node in self.client.get(url).data['nodes']}
+        self.assertEqual(nodes[self.task1.id]['priority'], 9)
+        
+        self.client.post('/api/tasks/fix_data/')
+        
+        nodes = {node['id']: node for node in self.client.get(url).data['nodes']}
+        self.assertEqual(nodes[self.task1.id]['priority'], 3)
+
+    def test_update_renders_dependencies_without_per_row_queries(self):
+        """Test a PATCH response reads dependencies with one joined query per relation."""
+        url = f'/api/tasks/{self.task1.id}/'
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        with CaptureQueriesContext(connection) as one_dependency:
+            self.client.patch(url, {'title': 'Renamed'}, format='json')
+        
+        for index in range(4):
+            extra = Task.objects.create(title=f"Extra {index}")
+            TaskDependency.objects.create(task=self.task1, depends_on=extra)
+        with CaptureQueriesContext(connection) as five_dependencies:
+            response = self.client.patch(url, {'title': 'Renamed again'}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['dependencies']), 5)
+        self.assertEqual(len(five_dependencies), len(one_dependency))
+
+    def test_mark_completed(self):
+        """Test marking a task completed writes the row directly."""
+        response = self.client.post(f'/api/tasks/{self.task1.id}/mark_completed/', format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], TaskStatus.COMPLETED)
+        self.assertEqual(response.data['version'], self.task1.version + 1)
+        
+        response = self.client.post('/api/tasks/999999/mark_completed/', format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_force_status_update(self):
+        """Test forcing a status validates it and returns the updated task."""
+        url = f'/api/tasks/{self.task1.id}/force_status_update/'
+        response = self.client.post(url, {'status': 'blocked'}, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['task']['status'], TaskStatus.BLOCKED)
+        
+        response = self.client.post(url, {'status': 'bogus'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_fix_all_tasks(self):
+        """Test invalid task data is repaired with set-based updates."""
+        Task.objects.filter(id=self.task1.id).update(status='bogus', estimated_hours=0)
+        
+        # Savepoint + three UPDATEs + release, regardless of the number of tasks
+        with self.assertNumQueries(5):
+            response = self.client.post('/api/tasks/fix_all_tasks/', format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['details']['status_fixed'], 1)
+        self.assertEqual(response.data['details']['hours_fixed'], 1)
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.status, TaskStatus.PENDING)
+        self.assertEqual(self.task1.estimated_hours, 8)
+
+    def test_conditional_get(self):
+        """Test unchanged data is answered with 304 until a task changes."""
+        url = '/api/tasks/'
+        response = self.client.get(url)
+        etag = response['ETag']
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        
+        self.task1.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_conditional_get_after_dependency_edit(self):
+        """Test editing a dependency in place changes the ETag of the read endpoints."""
+        dependency = TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        task3 = Task.objects.create(title="Task 3")
+        urls = ['/api/tasks/', f'/api/tasks/{self.task1.id}/', '/api/dependencies/graph_data/']
+        etags = {url: self.client.get(url)['ETag'] for url in urls}
+        
+        dependency.depends_on = task3
+        dependency.save(skip_validation=True)
+        
+        for url in urls:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+
+    def test_conditional_get_after_fix_data(self):
+        """Test a bulk data repair changes the ETag of the read endpoints."""
+        Task.objects.filter(id=self.task1.id).update(estimated_hours=0)
+        url = '/api/tasks/'
+        etag = self.client.get(url)['ETag']
+        
+        response = self.client.post('/api/tasks/fix_data/')
+        self.assertEqual(response.data['details']['invalid_hours_fixed'], 1)
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_graph_data(self):
+        """Test the adjacency list is built from one flat query."""
+        TaskDependency.objects.create(task=self.task1, depends_on=self.task2)
+        
+        url = '/api/dependencies/graph_data/'
+        # Two ETag aggregates and one flat edge query
+        with self.assertNumQueries(3):
+            response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['graph'], {self.task1.id: [self.task2.id]})
+        
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
     def test_get_task_stats(self):
         """Test getting task statistics."""
         url = '/api/tasks/stats/'
-        response = self.client.get(url)
+        # One conditional aggregate; an ETag would cost more than it saves
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('total', response.data)
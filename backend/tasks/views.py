@@ -1,20 +1,84 @@
 """
 API views for the tasks application.
 """
-from rest_framework import viewsets, status
+import logging
+
+from rest_framework import serializers, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from django.shortcuts import get_object_or_404
-from django.db import transaction
+from django.core.cache import cache
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import Count, Exists, F, Max, OuterRef, Prefetch, Q
 from django.core.exceptions import ValidationError as DjangoValidationError
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 
-from .models import Task, TaskDependency
+from .models import VALID_STATUSES, Task, TaskDependency, TaskStatus
 from .serializers import (
     TaskSerializer, TaskListSerializer, TaskDependencySerializer,
-    AddDependencySerializer, DependencyGraphSerializer
+    AddDependencySerializer
 )
 
+logger = logging.getLogger(__name__)
+
+# Seconds a built dependency graph response is kept in the cache
+GRAPH_CACHE_TIMEOUT = 300
+
+
+def _data_version():
+    """
+    Token that changes whenever a task or dependency is written or deleted
+    (last write time plus row count of each table). Writes that bypass
+    save(), such as queryset update(), must set updated_at themselves.
+    """
+    tasks = Task.objects.aggregate(changed=Max('updated_at'), count=Count('id'))
+    dependencies = TaskDependency.objects.aggregate(changed=Max('updated_at'), count=Count('id'))
+    parts = [
+        tasks['count'],
+        tasks['changed'].timestamp() if tasks['changed'] else 0,
+        dependencies['count'],
+        dependencies['changed'].timestamp() if dependencies['changed'] else 0,
+    ]
+    return ':'.join(map(str, parts))
+
+
+def _data_etag(request, *args, **kwargs):
+    """
+    ETag for the read endpoints, whose responses derive only from the task
+    and dependency tables. Computed once per request.
+    """
+    if not hasattr(request, '_data_version'):
+        request._data_version = _data_version()
+    return request._data_version
+
+
+# Answer conditional GETs with 304 before any serializer runs
+conditional_on_data = method_decorator(condition(etag_func=_data_etag))
+
+
+def _dependency_rows(queryset):
+    """
+    Dependency rows shaped like TaskDependencySerializer output, read with
+    one joined values query instead of hydrating model instances.
+    """
+    created_at_field = serializers.DateTimeField()
+    return [
+        {
+            'id': dependency_id,
+            'task': task_id,
+            'depends_on': depends_on_id,
+            'created_at': created_at_field.to_representation(created_at),
+            'task_title': task_title,
+            'depends_on_title': depends_on_title,
+        }
+        for dependency_id, task_id, depends_on_id, created_at, task_title, depends_on_title
+        in queryset.values_list(
+            'id', 'task_id', 'depends_on_id', 'created_at', 'task__title', 'depends_on__title'
+        )
+    ]
+
 
 class TaskViewSet(viewsets.ModelViewSet):
     """
@@ -24,188 +88,213 @@ class TaskViewSet(viewsets.ModelViewSet):
     """
     queryset = Task.objects.all()
     
+    def get_queryset(self):
+        """Annotate or prefetch dependency relationships for actions that render them."""
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            # GROUP BY queries drop Meta.ordering, so restate it (id breaks ties)
+            queryset = queryset.annotate(
+                dependency_count=Count('dependencies', distinct=True),
+                dependent_count=Count('dependent_tasks', distinct=True),
+            ).order_by('-created_at', '-id')
+        elif self.action == 'retrieve':
+            # Only the related task columns TaskSerializer renders
+            queryset = queryset.prefetch_related(
+                Prefetch('dependencies', queryset=TaskDependency.objects.select_related('depends_on').only(
+                    'id', 'task', 'depends_on__id', 'depends_on__title', 'depends_on__status'
+                )),
+                Prefetch('dependent_tasks', queryset=TaskDependency.objects.select_related('task').only(
+                    'id', 'depends_on', 'task__id', 'task__title', 'task__status'
+                )),
+            )
+        elif self.action in ('update', 'partial_update'):
+            # Dependency state for can_start/is_blocked, computed in the same SELECT
+            dependencies = TaskDependency.objects.filter(task=OuterRef('pk'))
+            queryset = queryset.annotate(
+                has_blocked_dependencies=Exists(
+                    dependencies.filter(depends_on__status=TaskStatus.BLOCKED)
+                ),
+                has_incomplete_dependencies=Exists(
+                    dependencies.exclude(depends_on__status=TaskStatus.COMPLETED)
+                ),
+            )
+        return queryset
+
+    @conditional_on_data
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_on_data
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == 'list':
             return TaskListSerializer
         return TaskSerializer
 
+    # Columns _safe_update may write directly
+    SAFE_UPDATE_FIELDS = ('title', 'description', 'status', 'priority', 'estimated_hours')
+
     def perform_update(self, serializer):
         """Override update to handle status propagation and version checking."""
-        import logging
-        logger = logging.getLogger(__name__)
-        
-        old_instance = self.get_object()
+        # The viewset already loaded the row; it is not modified until serializer.save()
+        old_instance = serializer.instance
         old_status = old_instance.status
         
-        # Special handling for problematic task 31
-        if old_instance.id == 31:
-            logger.error(f"Task 31 update attempt - incoming data: {self.request.data}")
-            logger.error(f"Task 31 current state: priority={old_instance.priority}, estimated_hours={old_instance.estimated_hours}, status={old_instance.status}")
-        
-        # Special handling for problematic task 22
-        if old_instance.id == 22:
-            logger.error(f"Task 22 update attempt - incoming data: {self.request.data}")
-            logger.error(f"Task 22 current state: priority={old_instance.priority}, estimated_hours={old_instance.estimated_hours}, status={old_instance.status}")
-        
         # Log the incoming data for debugging
-        logger.info(f"Updating task {old_instance.id} with data: {self.request.data}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Updating task %s with data: %s", old_instance.id, self.request.data)
         
         # Check for version in request data for concurrent update detection
         version = self.request.data.get('version')
         if version is not None:
             try:
                 version = int(version)
-                if version != old_instance.version:
-                    from rest_framework.exceptions import ValidationError
-                    raise ValidationError({
-                        'error': 'This task was modified by another user. Please refresh and try again.',
-                        'current_version': old_instance.version,
-                        'provided_version': version
-                    })
             except (ValueError, TypeError):
-                pass  # Ignore invalid version values
+                version = None  # Ignore invalid version values
+        
+        if version is not None:
+            # Bypasses TaskSerializer.update, so apply its NULL fallbacks here
+            validated_data = serializer.apply_null_defaults(old_instance, dict(serializer.validated_data))
+            self._versioned_update(old_instance, validated_data, version)
+            return
         
         try:
-            # For problematic tasks (31, 22), use raw SQL to bypass ALL validation
-            if old_instance.id in [31, 22]:
-                logger.error(f"Using raw SQL for problematic task {old_instance.id}")
-                
-                from django.db import connection
-                
-                # Build the SQL update dynamically based on provided fields
-                update_parts = []
-                params = []
-                
-                if 'priority' in self.request.data:
-                    try:
-                        priority = int(float(str(self.request.data['priority'])))
-                        if 1 <= priority <= 5:
-                            update_parts.append("priority = %s")
-                            params.append(priority)
-                    except:
-                        update_parts.append("priority = 3")
-                
-                if 'estimated_hours' in self.request.data:
-                    try:
-                        hours = int(float(str(self.request.data['estimated_hours'])))
-                        if 1 <= hours <= 200:
-                            update_parts.append("estimated_hours = %s")
-                            params.append(hours)
-                    except:
-                        update_parts.append("estimated_hours = 8")
-                
-                if 'status' in self.request.data:
-                    status_val = self.request.data['status']
-                    if status_val in ['pending', 'in_progress', 'completed', 'blocked']:
-                        update_parts.append("status = %s")
-                        params.append(status_val)
-                
-                if 'title' in self.request.data:
-                    update_parts.append("title = %s")
-                    params.append(str(self.request.data['title']))
-                
-                if 'description' in self.request.data:
-                    update_parts.append("description = %s")
-                    params.append(str(self.request.data['description']))
-                
-                if update_parts:
-                    update_parts.append("updated_at = NOW()")
-                    params.append(old_instance.id)
-                    
-                    sql = f"UPDATE tasks SET {', '.join(update_parts)} WHERE id = %s"
-                    
-                    with connection.cursor() as cursor:
-                        cursor.execute(sql, params)
-                    
-                    logger.error(f"Task {old_instance.id} updated successfully via raw SQL")
-                    return  # Skip normal serializer processing
-            
-            # Normal serializer processing for other tasks
             instance = serializer.save()
             
             # Temporarily disable automatic status propagation to avoid interference
             # if old_status != instance.status:
             #     instance.propagate_status_update()
                 
+        except (DatabaseError, TypeError, ValueError) as e:
+            # A full-row save can fail on bad legacy values in columns the
+            # request did not touch; write just the submitted columns instead
+            logger.warning("Full save failed for task %s, writing submitted fields only: %s", old_instance.id, e)
+            self._safe_update(
+                old_instance, serializer.apply_null_defaults(old_instance, dict(serializer.validated_data))
+            )
+        
         except Exception as e:
-            logger.error(f"Error updating task {old_instance.id}: {str(e)}")
-            logger.error(f"Serializer errors: {serializer.errors}")
-            logger.error(f"Request data: {self.request.data}")
-            
-            # Try to provide more specific error information
+            logger.error("Error updating task %s: %s", old_instance.id, e)
             if hasattr(e, 'detail'):
-                logger.error(f"Error detail: {e.detail}")
-            
-            # For task 31, provide a custom error response
-            if old_instance.id == 31:
-                from rest_framework.response import Response
-                from rest_framework import status
-                return Response(
-                    {'error': f'Task 31 update failed: {str(e)}', 'serializer_errors': serializer.errors},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
+                logger.error("Error detail: %s", e.detail)
             
             # Re-raise the exception to return proper error response
             raise
 
+    def _versioned_update(self, instance, validated_data, version):
+        """
+        Optimistic-locking update: write the submitted columns only if the row
+        still has the client's version, checked atomically by the UPDATE itself.
+        """
+        fields = {
+            field: value for field, value in validated_data.items()
+            if field in self.SAFE_UPDATE_FIELDS
+        }
+        now = timezone.now()
+        updated = Task.objects.filter(pk=instance.pk, version=version).update(
+            updated_at=now,
+            version=F('version') + 1,
+            **fields
+        )
+        if not updated:
+            raise ValidationError({
+                'error': 'This task was modified by another user. Please refresh and try again.',
+                'current_version': Task.objects.filter(pk=instance.pk).values_list('version', flat=True).first(),
+                'provided_version': version
+            })
+        
+        # Mirror the write on the instance rendered in the response
+        for field, value in fields.items():
+            setattr(instance, field, value)
+        instance.updated_at = now
+        instance.version = version + 1
+
+    def _safe_update(self, instance, validated_data):
+        """
+        Write only the submitted, already validated columns with a queryset
+        update, bypassing save(). Refreshes instance for the response.
+        """
+        fields = {
+            field: value for field, value in validated_data.items()
+            if field in self.SAFE_UPDATE_FIELDS
+        }
+        if fields:
+            Task.objects.filter(pk=instance.pk).update(
+                updated_at=timezone.now(),
+                version=F('version') + 1,
+                **fields
+            )
+        instance.refresh_from_db()
+
     def perform_destroy(self, instance):
         """Override destroy to handle dependent tasks."""
-        dependents = instance.get_dependents()
-        if dependents:
-            # Update dependent tasks before deletion
-            for dependent in dependents:
-                dependent.update_status_based_on_dependencies()
-        
-        instance.delete()
+        with transaction.atomic():
+            dependent_ids = list(
+                TaskDependency.objects.filter(depends_on=instance).values_list('task_id', flat=True)
+            )
+            instance.delete()
+            
+            if dependent_ids:
+                # Read the dependents' remaining dependency state in one SELECT, then
+                # write one UPDATE per resulting status. MySQL rejects an UPDATE whose
+                # subquery reads the table being updated, so the flags are not inlined.
+                remaining = TaskDependency.objects.filter(task=OuterRef('pk'))
+                rows = Task.objects.filter(id__in=dependent_ids).exclude(
+                    status=TaskStatus.COMPLETED
+                ).annotate(
+                    has_blocked=Exists(remaining.filter(depends_on__status=TaskStatus.BLOCKED)),
+                    has_incomplete=Exists(remaining.exclude(depends_on__status=TaskStatus.COMPLETED)),
+                ).values_list('id', 'status', 'has_blocked', 'has_incomplete')
+                
+                ids_by_status = {}
+                for task_id, current_status, has_blocked, has_incomplete in rows:
+                    new_status = Task.status_for(current_status, has_blocked, has_incomplete)
+                    if new_status != current_status:
+                        ids_by_status.setdefault(new_status, []).append(task_id)
+                now = timezone.now()
+                for new_status, ids in ids_by_status.items():
+                    Task.objects.filter(id__in=ids).update(status=new_status, updated_at=now)
 
     @action(detail=True, methods=['get'])
     def dependencies(self, request, pk=None):
         """Get all dependencies for a task."""
         task = self.get_object()
-        dependencies = TaskDependency.objects.filter(task=task).select_related('depends_on')
-        serializer = TaskDependencySerializer(dependencies, many=True)
-        return Response(serializer.data)
+        return Response(_dependency_rows(TaskDependency.objects.filter(task=task)))
 
     @action(detail=True, methods=['post'])
     def add_dependency(self, request, pk=None):
         """Add a dependency to a task."""
-        import logging
-        logger = logging.getLogger(__name__)
-        
         task = self.get_object()
         
-        logger.info(f"add_dependency called for task {task.id}")
-        logger.info(f"Request data: {request.data}")
+        logger.info("add_dependency called for task %s", task.id)
+        logger.debug("Request data: %s", request.data)
         
         serializer = AddDependencySerializer(
             data=request.data,
             context={'task_id': task.id}
         )
         
-        if serializer.is_valid():
-            depends_on_id = serializer.validated_data['depends_on_id']
-            depends_on = get_object_or_404(Task, id=depends_on_id)
-            
-            logger.info(f"Adding dependency: Task {task.id} depends on Task {depends_on_id}")
-            
-            # Check if dependency already exists
-            existing = TaskDependency.objects.filter(task=task, depends_on=depends_on).first()
-            if existing:
-                logger.warning(f"Dependency already exists: {existing.id}")
-                return Response(
-                    {'error': 'This dependency already exists.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Check for circular dependencies before creating
-            temp_dependency = TaskDependency(task=task, depends_on=depends_on)
-            
-            try:
-                cycle_path = temp_dependency.detect_circular_dependency()
+        try:
+            # Validation, cycle check and insert share one transaction. Nothing is
+            # locked, so concurrent opposite inserts (A->B and B->A) are not serialized.
+            with transaction.atomic():
+                if not serializer.is_valid():
+                    logger.error("Serializer validation failed: %s", serializer.errors)
+                    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
                 
-                if cycle_path:
-                    logger.warning(f"Circular dependency detected: {cycle_path}")
+                depends_on = serializer.validated_data['depends_on']
+                logger.info("Adding dependency: Task %s depends on Task %s", task.id, depends_on.id)
+                
+                # One recursive query instead of walking the graph per request
+                if TaskDependency.creates_cycle(task.id, depends_on.id):
+                    # Only rejected requests pay for reconstructing the path
+                    cycle_path = TaskDependency.find_cycle_path(
+                        task.id, depends_on.id
+                    ) or [task.id, depends_on.id, task.id]
+                    logger.warning("Circular dependency detected: %s", cycle_path)
                     return Response(
                         {
                             'error': 'Circular dependency detected',
@@ -213,91 +302,98 @@ class TaskViewSet(viewsets.ModelViewSet):
                         },
                         status=status.HTTP_400_BAD_REQUEST
                     )
-            except Exception as e:
-                logger.error(f"Error checking circular dependency: {str(e)}")
-                # If circular dependency check fails, allow the creation
-                # (better to allow than to block legitimate dependencies)
-                pass
-            
-            try:
-                with transaction.atomic():
-                    # Create dependency with skip_validation to avoid issues with problematic tasks
-                    dependency = TaskDependency(task=task, depends_on=depends_on)
+                
+                # Create dependency with skip_validation: both checks were done above.
+                # The unique constraint replaces a separate duplicate lookup; save()
+                # runs in its own savepoint, so this transaction survives a duplicate.
+                dependency = TaskDependency(task=task, depends_on=depends_on)
+                try:
                     dependency.save(skip_validation=True)
-                    
-                    logger.info(f"Dependency created successfully: {dependency.id}")
-                    
-                    # Return the created dependency
-                    response_serializer = TaskDependencySerializer(dependency)
+                except IntegrityError:
+                    logger.warning("Dependency already exists: %s -> %s", task.id, depends_on.id)
                     return Response(
-                        response_serializer.data,
-                        status=status.HTTP_201_CREATED
+                        {'error': 'This dependency already exists.'},
+                        status=status.HTTP_400_BAD_REQUEST
                     )
-                    
-            except DjangoValidationError as e:
-                logger.error(f"Django validation error: {str(e)}")
-                return Response(
-                    {'error': str(e)},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            except Exception as e:
-                logger.error(f"Unexpected error creating dependency: {str(e)}")
+                
+                logger.info("Dependency created successfully: %s", dependency.id)
+                
+                # Return the created dependency
+                response_serializer = TaskDependencySerializer(dependency)
                 return Response(
-                    {'error': f'Failed to create dependency: {str(e)}'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                    response_serializer.data,
+                    status=status.HTTP_201_CREATED
                 )
-        
-        logger.error(f"Serializer validation failed: {serializer.errors}")
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+                
+        except DjangoValidationError as e:
+            logger.error("Django validation error: %s", e)
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            logger.error("Unexpected error creating dependency: %s", e)
+            return Response(
+                {'error': f'Failed to create dependency: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
     @action(detail=True, methods=['delete'], url_path='dependencies/(?P<dependency_id>[^/.]+)')
     def remove_dependency(self, request, pk=None, dependency_id=None):
         """Remove a dependency from a task."""
-        import logging
-        logger = logging.getLogger(__name__)
-        
         task = self.get_object()
         
-        logger.info(f"remove_dependency called for task {task.id}, dependency_id: {dependency_id}")
+        logger.info("remove_dependency called for task %s, dependency_id: %s", task.id, dependency_id)
+        
+        # Cast once so both lookups compare integers; anything else cannot match
+        try:
+            dependency_id = int(dependency_id)
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'Dependency not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
         try:
-            # First try to find by TaskDependency ID
-            dependency = TaskDependency.objects.filter(
-                id=dependency_id,
-                task=task
-            ).first()
-            
-            # If not found, try to find by depends_on task ID (fallback for compatibility)
-            if not dependency:
-                logger.info(f"TaskDependency ID {dependency_id} not found, trying as task ID")
-                dependency = TaskDependency.objects.filter(
-                    task=task,
-                    depends_on_id=dependency_id
-                ).first()
-            
-            if not dependency:
-                logger.error(f"No dependency found for task {task.id} with ID {dependency_id}")
-                return Response(
-                    {'error': 'Dependency not found'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            
-            logger.info(f"Found dependency: {dependency.id}, removing...")
-            
             with transaction.atomic():
-                dependency.delete()
-                # Update task status after removing dependency
-                try:
-                    task.update_status_based_on_dependencies()
-                except Exception as e:
-                    logger.warning(f"Failed to update task status: {str(e)}")
-                    # Don't fail the deletion if status update fails
+                # First try to delete by TaskDependency ID
+                deleted, _ = TaskDependency.objects.filter(
+                    id=dependency_id,
+                    task=task
+                ).delete()
+                
+                # If not found, try by depends_on task ID (fallback for compatibility)
+                if not deleted:
+                    logger.info("TaskDependency ID %s not found, trying as task ID", dependency_id)
+                    deleted, _ = TaskDependency.objects.filter(
+                        task=task,
+                        depends_on_id=dependency_id
+                    ).delete()
+                
+                if not deleted:
+                    logger.error("No dependency found for task %s with ID %s", task.id, dependency_id)
+                    return Response(
+                        {'error': 'Dependency not found'},
+                        status=status.HTTP_404_NOT_FOUND
+                    )
+                
+                # Update task status from its remaining dependencies without the save() path.
+                # The version is left alone: a dependency-driven status change is not a
+                # client edit and must not fail other clients' optimistic locks.
+                new_status = task.resolve_status(list(
+                    TaskDependency.objects.filter(task=task).values_list('depends_on__status', flat=True)
+                ))
+                if new_status != task.status:
+                    Task.objects.filter(id=task.id).update(
+                        status=new_status,
+                        updated_at=timezone.now()
+                    )
             
-            logger.info(f"Dependency removed successfully")
+            logger.info("Dependency removed successfully")
             return Response(status=status.HTTP_204_NO_CONTENT)
             
         except Exception as e:
-            logger.error(f"Error removing dependency: {str(e)}")
+            logger.error("Error removing dependency: %s", e)
             return Response(
                 {'error': f'Failed to remove dependency: {str(e)}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -307,50 +403,41 @@ class TaskViewSet(viewsets.ModelViewSet):
     def dependents(self, request, pk=None):
         """Get all tasks that depend on this task."""
         task = self.get_object()
-        dependents = TaskDependency.objects.filter(depends_on=task).select_related('task')
-        serializer = TaskDependencySerializer(dependents, many=True)
-        return Response(serializer.data)
+        return Response(_dependency_rows(TaskDependency.objects.filter(depends_on=task)))
+
+    def _write_status(self, pk, new_status):
+        """
+        Write a status straight to the row, bypassing model validation and
+        save(). Returns the updated task, or None if it does not exist.
+        """
+        updated = Task.objects.filter(pk=pk).update(
+            status=new_status,
+            updated_at=timezone.now(),
+            version=F('version') + 1
+        )
+        if not updated:
+            return None
+        return Task.objects.get(pk=pk)
 
     @action(detail=True, methods=['post'])
     def mark_completed(self, request, pk=None):
         """Mark a task as completed - completely bypass all validation."""
-        import logging
-        logger = logging.getLogger(__name__)
-        
         try:
-            # Use raw SQL to completely bypass ALL Django validation
-            from django.db import connection
+            logger.info("Attempting to mark task %s as completed", pk)
             
-            logger.info(f"Attempting to mark task {pk} as completed using raw SQL")
+            task = self._write_status(pk, TaskStatus.COMPLETED)
+            if task is None:
+                logger.error("Task %s not found in database", pk)
+                return Response({'error': 'Task not found'}, status=404)
             
-            with connection.cursor() as cursor:
-                # Update directly in database
-                cursor.execute("""
-                    UPDATE tasks 
-                    SET status = 'completed', 
-                        updated_at = NOW()
-                    WHERE id = %s
-                """, [pk])
-                
-                if cursor.rowcount == 0:
-                    logger.error(f"Task {pk} not found in database")
-                    return Response({'error': 'Task not found'}, status=404)
-                
-                logger.info(f"Task {pk} marked as completed successfully via raw SQL")
-            
-            # Get the updated task and return it
-            task = Task.objects.get(id=pk)
+            logger.info("Task %s marked as completed successfully", pk)
             serializer = self.get_serializer(task)
             
             return Response(serializer.data)
             
-        except Task.DoesNotExist:
-            logger.error(f"Task {pk} not found after update")
-            return Response({'error': 'Task not found'}, status=404)
-            
         except Exception as e:
-            logger.error(f"mark_completed failed for task {pk}: {str(e)}")
-            logger.error(f"Exception type: {type(e).__name__}")
+            logger.error("mark_completed failed for task %s: %s", pk, e)
+            logger.error("Exception type: %s", type(e).__name__)
             
             return Response(
                 {'error': f'Failed to mark task as completed: {str(e)}'},
@@ -358,10 +445,44 @@ class TaskViewSet(viewsets.ModelViewSet):
             )
 
     @action(detail=False, methods=['get'])
+    @conditional_on_data
     def graph(self, request):
         """Get dependency graph data for visualization."""
-        serializer = DependencyGraphSerializer({})
-        return Response(serializer.to_representation(None))
+        cache_key = 'task_graph:' + _data_etag(request)
+        payload = cache.get(cache_key)
+        if payload is not None:
+            return Response(payload)
+        
+        # Read plain rows; no model instances or joins are needed here
+        # priority/estimated_hours are never null; x/y are calculated by frontend layout
+        nodes = [
+            {
+                'id': task_id,
+                'title': title,
+                'status': task_status,
+                'priority': priority or 3,
+                'estimated_hours': estimated_hours or 8,
+                'x': 0,
+                'y': 0,
+            }
+            for task_id, title, task_status, priority, estimated_hours in Task.objects.values_list(
+                'id', 'title', 'status', 'priority', 'estimated_hours'
+            )
+        ]
+        
+        edges = [
+            {'id': dep_id, 'source': source_id, 'target': target_id}
+            for dep_id, source_id, target_id in TaskDependency.objects.values_list(
+                'id', 'depends_on_id', 'task_id'
+            )
+        ]
+        
+        payload = {
+            'nodes': nodes,
+            'edges': edges
+        }
+        cache.set(cache_key, payload, GRAPH_CACHE_TIMEOUT)
+        return Response(payload)
 
     @action(detail=False, methods=['post'])
     def fix_task_31(self, request):
@@ -393,46 +514,33 @@ class TaskViewSet(viewsets.ModelViewSet):
     def fix_all_tasks(self, request):
         """Fix all problematic tasks that are causing 400 errors."""
         try:
-            from django.db import transaction
-            
-            fixed_tasks = []
+            # One set-based UPDATE per kind of problem instead of a save() per task
+            fixed = {'updated_at': timezone.now(), 'version': F('version') + 1}
             
             with transaction.atomic():
-                # Get all tasks
-                all_tasks = Task.objects.all()
+                # Fix priority issues
+                priority_fixed = Task.objects.filter(
+                    Q(priority__isnull=True) | ~Q(priority__in=[1, 2, 3, 4, 5])
+                ).update(priority=3, **fixed)
                 
-                for task in all_tasks:
-                    changes = []
-                    
-                    # Fix priority issues
-                    if task.priority is None or not (1 <= task.priority <= 5):
-                        task.priority = 3
-                        changes.append('priority')
-                    
-                    # Fix estimated_hours issues
-                    if task.estimated_hours is None or task.estimated_hours <= 0:
-                        task.estimated_hours = 8
-                        changes.append('estimated_hours')
-                    
-                    # Fix status issues
-                    valid_statuses = ['pending', 'in_progress', 'completed', 'blocked']
-                    if task.status not in valid_statuses:
-                        task.status = 'pending'
-                        changes.append('status')
-                    
-                    # Save if any changes were made
-                    if changes:
-                        changes.append('updated_at')
-                        task.save(update_fields=changes)
-                        fixed_tasks.append({
-                            'id': task.id,
-                            'title': task.title,
-                            'changes': changes
-                        })
+                # Fix estimated_hours issues
+                hours_fixed = Task.objects.filter(
+                    Q(estimated_hours__isnull=True) | Q(estimated_hours__lte=0)
+                ).update(estimated_hours=8, **fixed)
+                
+                # Fix status issues
+                status_fixed = Task.objects.exclude(
+                    status__in=VALID_STATUSES
+                ).update(status=TaskStatus.PENDING, **fixed)
             
+            total_fixed = priority_fixed + hours_fixed + status_fixed
             return Response({
-                'message': f'Fixed {len(fixed_tasks)} tasks',
-                'fixed_tasks': fixed_tasks
+                'message': f'Fixed {total_fixed} data issues',
+                'details': {
+                    'priority_fixed': priority_fixed,
+                    'hours_fixed': hours_fixed,
+                    'status_fixed': status_fixed
+                }
             })
             
         except Exception as e:
@@ -445,24 +553,10 @@ class TaskViewSet(viewsets.ModelViewSet):
     def force_complete(self, request, pk=None):
         """Force complete a task - bypasses ALL validation."""
         try:
-            # Use raw SQL to completely bypass Django ORM validation
-            from django.db import connection
-            
-            with connection.cursor() as cursor:
-                # Update directly in database
-                cursor.execute("""
-                    UPDATE tasks 
-                    SET status = 'completed', 
-                        updated_at = NOW(),
-                        version = version + 1
-                    WHERE id = %s
-                """, [pk])
-                
-                if cursor.rowcount == 0:
-                    return Response({'error': 'Task not found'}, status=404)
+            task = self._write_status(pk, TaskStatus.COMPLETED)
+            if task is None:
+                return Response({'error': 'Task not found'}, status=404)
             
-            # Get the updated task
-            task = Task.objects.get(id=pk)
             serializer = self.get_serializer(task)
             
             return Response({
@@ -481,27 +575,13 @@ class TaskViewSet(viewsets.ModelViewSet):
         """Force update task status - bypasses ALL validation."""
         try:
             new_status = request.data.get('status')
-            if not new_status or new_status not in ['pending', 'in_progress', 'completed', 'blocked']:
+            if not isinstance(new_status, str) or new_status not in VALID_STATUSES:
                 return Response({'error': 'Invalid status'}, status=400)
             
-            # Use raw SQL to completely bypass Django ORM validation
-            from django.db import connection
+            task = self._write_status(pk, new_status)
+            if task is None:
+                return Response({'error': 'Task not found'}, status=404)
             
-            with connection.cursor() as cursor:
-                # Update directly in database
-                cursor.execute("""
-                    UPDATE tasks 
-                    SET status = %s, 
-                        updated_at = NOW(),
-                        version = version + 1
-                    WHERE id = %s
-                """, [new_status, pk])
-                
-                if cursor.rowcount == 0:
-                    return Response({'error': 'Task not found'}, status=404)
-            
-            # Get the updated task
-            task = Task.objects.get(id=pk)
             serializer = self.get_serializer(task)
             
             return Response({
@@ -518,20 +598,28 @@ class TaskViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['post'])
     def fix_data(self, request):
         """Fix any tasks with null priority or estimated_hours values."""
-        from django.db import transaction
-        
+        # Bulk updates skip auto_now, and the read endpoints' ETag relies on updated_at
+        now = timezone.now()
         with transaction.atomic():
             # Fix tasks with null priority
-            null_priority_count = Task.objects.filter(priority__isnull=True).update(priority=3)
+            null_priority_count = Task.objects.filter(priority__isnull=True).update(
+                priority=3, updated_at=now
+            )
             
             # Fix tasks with null estimated_hours
-            null_hours_count = Task.objects.filter(estimated_hours__isnull=True).update(estimated_hours=8)
+            null_hours_count = Task.objects.filter(estimated_hours__isnull=True).update(
+                estimated_hours=8, updated_at=now
+            )
             
             # Fix tasks with invalid priority (outside 1-5 range)
-            invalid_priority_count = Task.objects.exclude(priority__in=[1, 2, 3, 4, 5]).update(priority=3)
+            invalid_priority_count = Task.objects.exclude(priority__in=[1, 2, 3, 4, 5]).update(
+                priority=3, updated_at=now
+            )
             
             # Fix tasks with invalid estimated_hours (0 or negative)
-            invalid_hours_count = Task.objects.filter(estimated_hours__lte=0).update(estimated_hours=8)
+            invalid_hours_count = Task.objects.filter(estimated_hours__lte=0).update(
+                estimated_hours=8, updated_at=now
+            )
             
             total_fixed = null_priority_count + null_hours_count + invalid_priority_count + invalid_hours_count
             
@@ -548,19 +636,22 @@ class TaskViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def debug_data(self, request):
         """Debug endpoint to see current task data."""
-        tasks = Task.objects.all()
-        debug_info = []
-        
-        for task in tasks:
-            debug_info.append({
-                'id': task.id,
-                'title': task.title,
-                'priority': task.priority,
-                'priority_type': type(task.priority).__name__,
-                'estimated_hours': task.estimated_hours,
-                'estimated_hours_type': type(task.estimated_hours).__name__,
-                'status': task.status
-            })
+        # Plain rows streamed in chunks, so only the output list is held in
+        # memory; the *_type fields report the stored values (e.g. NoneType)
+        debug_info = [
+            {
+                'id': task_id,
+                'title': title,
+                'priority': priority,
+                'priority_type': type(priority).__name__,
+                'estimated_hours': estimated_hours,
+                'estimated_hours_type': type(estimated_hours).__name__,
+                'status': task_status
+            }
+            for task_id, title, priority, estimated_hours, task_status in Task.objects.values_list(
+                'id', 'title', 'priority', 'estimated_hours', 'status'
+            ).iterator(chunk_size=2000)
+        ]
         
         return Response({
             'tasks': debug_info,
@@ -570,19 +661,16 @@ class TaskViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Get task statistics."""
-        total_tasks = Task.objects.count()
-        pending_tasks = Task.objects.filter(status='pending').count()
-        in_progress_tasks = Task.objects.filter(status='in_progress').count()
-        completed_tasks = Task.objects.filter(status='completed').count()
-        blocked_tasks = Task.objects.filter(status='blocked').count()
+        # One query with conditional aggregates instead of one COUNT per status
+        stats = Task.objects.aggregate(
+            total=Count('id'),
+            pending=Count('id', filter=Q(status='pending')),
+            in_progress=Count('id', filter=Q(status='in_progress')),
+            completed=Count('id', filter=Q(status='completed')),
+            blocked=Count('id', filter=Q(status='blocked')),
+        )
         
-        return Response({
-            'total': total_tasks,
-            'pending': pending_tasks,
-            'in_progress': in_progress_tasks,
-            'completed': completed_tasks,
-            'blocked': blocked_tasks,
-        })
+        return Response(stats)
 
 
 class TaskDependencyViewSet(viewsets.ReadOnlyModelViewSet):
@@ -591,10 +679,14 @@ class TaskDependencyViewSet(viewsets.ReadOnlyModelViewSet):
     
     Provides read-only access to dependency relationships.
     """
-    queryset = TaskDependency.objects.all().select_related('task', 'depends_on')
+    # Only the columns TaskDependencySerializer reads from the joined tasks
+    queryset = TaskDependency.objects.select_related('task', 'depends_on').only(
+        'id', 'created_at', 'task__id', 'task__title', 'depends_on__id', 'depends_on__title'
+    )
     serializer_class = TaskDependencySerializer
 
     @action(detail=False, methods=['get'])
+    @conditional_on_data
     def graph_data(self, request):
         """Get dependency graph as adjacency list."""
         graph = TaskDependency.get_dependency_graph()